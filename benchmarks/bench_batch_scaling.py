@@ -0,0 +1,74 @@
+# Throughput of score_file_parallel with 1/2/4/8 workers, plus how much memory the workers
+# really add (proportional set size, which splits shared model pages between processes).
+#
+#   python benchmarks/bench_batch_scaling.py --rows 1000000 --workers 1 2 4 8
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from carvault.batch import default_workers, score_file, score_file_parallel
+from carvault.dataset import load_dataset
+from carvault.features import FEATURES
+from carvault.registry import load_model
+
+
+def memory_kb(pid, field):
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunk-rows', type=int, default=50_000)
+    parser.add_argument('--start-method', default=None, choices=['fork', 'spawn', 'forkserver'])
+    parser.add_argument('--version', default=None)
+    args = parser.parse_args()
+
+    model = load_model(args.version)
+    tmp = tempfile.mkdtemp(prefix='carvault_bench_')
+    source = os.path.join(tmp, 'inventory.parquet')
+    load_dataset()[FEATURES].sample(args.rows, replace=True, random_state=0).to_parquet(source, index=False)
+    print(f"{args.rows:,} rows, {default_workers()} usable cores, model {model.version}")
+
+    baseline = None
+    for workers in args.workers:
+        peak = {'rss': 0, 'pss': 0}
+
+        def sample(report):
+            children = mp.active_children()
+            peak['rss'] = max(peak['rss'], sum(memory_kb(p.pid, 'Rss') for p in children))
+            peak['pss'] = max(peak['pss'], sum(memory_kb(p.pid, 'Pss') for p in children))
+
+        out = os.path.join(tmp, f'valued_{workers}.parquet')
+        with open(source, 'rb') as f:
+            if workers == 1:
+                report = score_file(model.pipeline, f, out, 'parquet', args.chunk_rows, options=model.options)
+            else:
+                report = score_file_parallel(model, f, out, 'parquet', workers, args.chunk_rows, sample,
+                                             model.options, start_method=args.start_method)
+        baseline = baseline or report.seconds
+        line = f"{workers:>2} workers: {report.seconds:6.2f}s  {report.rows_per_sec:>9,.0f} rows/s  {baseline / report.seconds:4.2f}x"
+        if workers > 1:
+            line += f"  | workers RSS {peak['rss'] / 1024:6.0f} MB, PSS {peak['pss'] / 1024:6.0f} MB"
+        print(line)
+    reference = pd.read_parquet(os.path.join(tmp, f'valued_{args.workers[0]}.parquet'))
+    for workers in args.workers[1:]:
+        assert reference.equals(pd.read_parquet(os.path.join(tmp, f'valued_{workers}.parquet')))
+    print("Outputs identical across worker counts")
+
+
+if __name__ == '__main__':
+    main()
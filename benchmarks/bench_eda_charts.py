@@ -0,0 +1,177 @@
+# Time and payload of the EDA charts as the dataset grows, for three paths:
+#   summary    what the dashboard runs: charts derived from the precomputed summary
+#              (built once at ingest time, timed separately as "build")
+#   row-level  the same aggregates computed from the rows on every request (the baseline
+#              the summary replaced; kept below)
+#   legacy     the original matplotlib scatter rendered to a base64 PNG
+#
+#   python benchmarks/bench_eda_charts.py --scales 1 10 100
+import argparse
+import base64
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from carvault import charts
+from carvault.dataset import load_dataset
+from carvault.summary import bivariate_chart, build_summary, correlation_chart, univariate_chart
+
+KDE_GRID = 256
+
+
+def _values(series):
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values[np.isfinite(values)]
+
+
+def _edges(values, bins):
+    lo, hi = (float(values.min()), float(values.max())) if len(values) else (0.0, 1.0)
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, bins + 1)
+
+
+def numeric_histogram(series, bins=charts.HIST_BINS):
+    """Binned counts plus a smoothed density curve scaled to the same axis (a KDE stand-in)."""
+    values = _values(series)
+    edges = _edges(values, bins)
+    counts, _ = np.histogram(values, bins=edges)
+    hist = pd.DataFrame({'start': edges[:-1], 'end': edges[1:], 'count': counts})
+
+    # Gaussian-smoothed fine histogram: O(grid) instead of evaluating a KDE at every row
+    fine_edges = np.linspace(edges[0], edges[-1], KDE_GRID + 1)
+    fine, _ = np.histogram(values, bins=fine_edges)
+    std = values.std() if len(values) > 1 else 0.0
+    bandwidth = 1.06 * std * max(len(values), 1) ** -0.2  # Silverman's rule
+    sigma = bandwidth / (fine_edges[1] - fine_edges[0]) if bandwidth > 0 else 0.0
+    if sigma > 0:
+        radius = int(np.ceil(3 * sigma))
+        kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+        fine = np.convolve(fine, kernel / kernel.sum(), mode='same')
+    bin_ratio = (edges[1] - edges[0]) / (fine_edges[1] - fine_edges[0])
+    density = pd.DataFrame({'x': (fine_edges[:-1] + fine_edges[1:]) / 2, 'density': fine * bin_ratio})
+    return hist, density
+
+
+def density_grid(x, y, bins=charts.DENSITY_BINS):
+    """Non-empty cells of a 2-D histogram; replaces a one-mark-per-row scatter."""
+    mask = x.notna().to_numpy() & y.notna().to_numpy()
+    xv = x.to_numpy(dtype=np.float64, na_value=np.nan)[mask]
+    yv = y.to_numpy(dtype=np.float64, na_value=np.nan)[mask]
+    x_edges, y_edges = _edges(xv, bins), _edges(yv, bins)
+    counts, _, _ = np.histogram2d(xv, yv, bins=[x_edges, y_edges])
+    xi, yi = np.nonzero(counts)
+    return pd.DataFrame({
+        'x_start': x_edges[xi], 'x_end': x_edges[xi + 1],
+        'y_start': y_edges[yi], 'y_end': y_edges[yi + 1],
+        'count': counts[xi, yi].astype(np.int64),
+    })
+
+
+def category_quantiles(categories, values, top=charts.TOP_CATEGORIES):
+    """Box-plot statistics of a numeric column for the most frequent categories."""
+    frame = pd.DataFrame({'category': categories.astype(str), 'value': values}).dropna()
+    keep = frame['category'].value_counts().head(top).index
+    grouped = frame[frame['category'].isin(keep)].groupby('category')['value']
+    stats = grouped.quantile([0.0, 0.25, 0.5, 0.75, 1.0]).unstack()
+    stats.columns = ['min', 'q1', 'median', 'q3', 'max']
+    stats['count'] = grouped.size()
+    return stats.reset_index().sort_values('median', ascending=False)
+
+
+def category_crosstab(x, y, top=charts.TOP_CATEGORIES):
+    x, y = x.astype(str), y.astype(str)
+    keep_x, keep_y = x.value_counts().head(top).index, y.value_counts().head(top).index
+    mask = (x.isin(keep_x) & y.isin(keep_y)).to_numpy()
+    counts = pd.crosstab(x[mask], y[mask]).stack()
+    counts = counts[counts > 0]
+    return pd.DataFrame({
+        'x': counts.index.get_level_values(0), 'y': counts.index.get_level_values(1), 'count': counts.to_numpy(),
+    })
+
+
+def correlation_long(df):
+    corr = df.corr(numeric_only=True)
+    long = corr.stack().reset_index()
+    long.columns = ['x', 'y', 'corr']
+    return long
+
+
+def bivariate_data(df, x_feature, y_feature):
+    """Aggregate for a pair of columns, chosen by their types."""
+    x, y = df[x_feature], df[y_feature]
+    kind = charts.bivariate_kind(charts.is_numeric(x), charts.is_numeric(y))
+    if kind == 'density':
+        return kind, density_grid(x, y)
+    if kind == 'box':
+        return kind, category_quantiles(x, y)
+    if kind == 'box_h':
+        return kind, category_quantiles(y, x)
+    return kind, category_crosstab(x, y)
+
+
+def bivariate(df, x_feature, y_feature):
+    kind, data = bivariate_data(df, x_feature, y_feature)
+    return data, charts.bivariate_spec(kind, x_feature, y_feature)
+
+
+def legacy_scatter(df, x, y):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    buf = io.BytesIO()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(data=df, x=x, y=y, alpha=0.8, color='#92fe9d', ax=ax)
+    plt.tight_layout()
+    plt.savefig(buf, format="png")
+    plt.close()
+    return base64.b64encode(buf.getvalue()).decode("utf-8")
+
+
+def payload_bytes(data, spec):
+    frames = [data] if data is not None else list(spec.get('datasets', {}).values())
+    return sum(len(frame.to_json(orient='records')) for frame in frames)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--legacy-max-rows', type=int, default=1_000_000, help="skip the PNG scatter above this")
+    args = parser.parse_args()
+
+    base = load_dataset()
+    x, y = 'KM Driven', 'Selling Price (in Lakhs)'
+    for scale in args.scales:
+        df = pd.concat([base] * scale, ignore_index=True)
+        summary, t_build = timed(lambda: build_summary(df))
+        (data, spec), t_scatter = timed(lambda: bivariate_chart(summary, x, y))
+        _, t_hist = timed(lambda: univariate_chart(summary, y))
+        _, t_corr = timed(lambda: correlation_chart(summary))
+        print(f"{len(df):>10,} rows | summary (build {t_build:6.2f} s once): density {t_scatter * 1000:6.1f} ms "
+              f"{payload_bytes(data, spec) / 1024:6.1f} KB | hist {t_hist * 1000:6.1f} ms | corr {t_corr * 1000:6.1f} ms")
+
+        (data, spec), t_scatter = timed(lambda: bivariate(df, x, y))
+        _, t_hist = timed(lambda: numeric_histogram(df[y]))
+        _, t_corr = timed(lambda: correlation_long(df))
+        line = (f"{'':>10}      | row-level per request:          density {t_scatter * 1000:6.1f} ms "
+                f"{payload_bytes(data, spec) / 1024:6.1f} KB | hist {t_hist * 1000:6.1f} ms | corr {t_corr * 1000:6.1f} ms")
+        if len(df) <= args.legacy_max_rows:
+            png, t_png = timed(lambda: legacy_scatter(df, x, y))
+            line += f" | legacy PNG scatter {t_png * 1000:8.1f} ms {len(png) / 1024:6.1f} KB"
+        print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# Sparse one-hot ColumnTransformer vs the compact ordinal encoder: matrix width, encoding
+# time and peak memory, then the same random forest fitted on each (accuracy, latency).
+#
+#   python benchmarks/bench_encoding.py --rows 200000
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from carvault.dataset import load_dataset
+from carvault.explain import BatchExplainer
+from carvault.features import FEATURES, TARGET
+from carvault.forest import DENSE_CHUNK_ROWS, CompiledEncoder, CompiledForest, CompiledPipeline
+from carvault.training import build_pipeline, build_preprocessor, regression_metrics
+
+
+def measure(fn, repeats=3):
+    """(result, median seconds, peak traced MB)."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, float(np.median(timings)), peak / 2**20
+
+
+def chunked(encode, X, width):
+    """Encode X chunk by chunk into one preallocated float32 buffer, as the scoring paths do."""
+    buffer = np.empty((min(len(X), DENSE_CHUNK_ROWS), width), dtype=np.float32)
+    for start in range(0, len(X), DENSE_CHUNK_ROWS):
+        encode(X.iloc[start:start + DENSE_CHUNK_ROWS], buffer)
+    return buffer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    args = parser.parse_args()
+
+    df = load_dataset()
+    X, y = df[FEATURES], df[TARGET]
+    big = X.sample(args.rows, replace=True, random_state=0).reset_index(drop=True)
+
+    print(f"--- Encoding {args.rows:,} rows ---")
+    onehot = build_preprocessor('onehot').fit(X)
+    ordinal = build_preprocessor('ordinal').fit(X)
+    fast_onehot, fast_ordinal = CompiledEncoder.from_preprocessor(onehot), CompiledEncoder.from_preprocessor(ordinal)
+    cases = [
+        ("ColumnTransformer one-hot, toarray().astype(float)", onehot.transform(big[:1]).shape[1],
+         lambda: onehot.transform(big).toarray().astype(float)),
+        ("compiled one-hot float32, chunked buffer", fast_onehot.width,
+         lambda: chunked(lambda c, b: fast_onehot.transform(c, out=b), big, fast_onehot.width)),
+        ("compiled ordinal float32, chunked buffer", fast_ordinal.width,
+         lambda: chunked(lambda c, b: fast_ordinal.transform(c, out=b), big, fast_ordinal.width)),
+    ]
+    for label, width, fn in cases:
+        _, seconds, peak = measure(fn)
+        print(f"{label:>52}: {width:>4} columns | {seconds * 1000:8.1f} ms | peak {peak:8.1f} MB")
+
+    print(f"\n--- RandomForest ({args.trees} trees) per encoding ---")
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    for encoding in ['onehot', 'ordinal']:
+        pipeline = build_pipeline('rf', n_jobs=args.n_jobs, encoding=encoding)
+        pipeline.set_params(regressor__n_estimators=args.trees)
+        start = time.perf_counter()
+        pipeline.fit(X_train, y_train)
+        fit = time.perf_counter() - start
+        pipeline.named_steps['regressor'].set_params(n_jobs=1)
+        rmse = regression_metrics(y_test, pipeline.predict(X_test))['rmse']
+        compiled = CompiledPipeline(pipeline, CompiledForest.from_estimator(pipeline.named_steps['regressor']))
+        _, one, _ = measure(lambda: compiled.predict(big.iloc[:1]), repeats=50)
+        _, bulk, peak = measure(lambda: compiled.predict(big))
+        _, shap, _ = measure(lambda: BatchExplainer(compiled).contributions(big.iloc[:10_000]), repeats=1)
+        print(f"{encoding:>8}: fit {fit:6.1f}s | holdout RMSE {rmse:.4f} | {compiled.forest.node_count:>9,} nodes | "
+              f"1 row {one * 1000:6.2f} ms | {args.rows:,} rows {bulk:6.2f}s (peak {peak:6.1f} MB) | "
+              f"SHAP 10k rows {shap:5.2f}s")
+
+
+if __name__ == '__main__':
+    main()
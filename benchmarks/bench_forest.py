@@ -0,0 +1,54 @@
+# Compare sklearn's RandomForest predict with the compiled node-array engine.
+#
+#   python train_model.py && python benchmarks/bench_forest.py [--version VERSION]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from carvault.dataset import load_dataset
+from carvault.features import FEATURES
+from carvault.forest import CompiledForest, CompiledPipeline
+from carvault.registry import load_model
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--version', default=None, help="registry version (default: CURRENT)")
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    pipeline = load_model(args.version).pipeline
+    compiled = CompiledPipeline(pipeline, CompiledForest.from_estimator(pipeline.named_steps['regressor']))
+    df = load_dataset()
+    big = df[FEATURES].sample(args.rows, replace=True, random_state=0).reset_index(drop=True)
+    one = big.iloc[:1]
+
+    # Check the compiled encoder + node-array walk directly, not the bulk fallback
+    sample = big.iloc[:min(args.rows, 20_000)]
+    expected = pipeline.predict(sample)
+    actual = compiled.forest.predict(compiled.transform(sample))
+    print(f"Max abs difference over {len(sample):,} rows: {np.max(np.abs(expected - actual)):.3g}")
+
+    cases = [('1 row', one, args.repeats), ('100 rows', big.iloc[:100], args.repeats), (f'{args.rows:,} rows', big, 3)]
+    for label, X, repeats in cases:
+        sk = best_of(lambda: pipeline.predict(X), repeats)
+        cf = best_of(lambda: compiled.predict(X), repeats)
+        print(f"{label:>12}: sklearn {sk * 1000:9.2f} ms | compiled {cf * 1000:9.2f} ms | {sk / cf:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# Server work per Prediction-page session: script runs and CPU seconds for a user who fills
+# in the seven inputs and values N cars, with per-widget reruns (the previous layout) vs the
+# form + fragment layout.
+#
+#   python benchmarks/bench_prediction_session.py --cars 5
+#
+# AppTest always runs the whole script, so the fragment's own cost is read from its
+# 'valuation_fragment' CPU span; the rest of an idle run is page chrome the fragment skips.
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+from streamlit.testing.v1 import AppTest
+
+from carvault.dataset import load_dataset
+from carvault.telemetry import TELEMETRY
+
+PAGE = os.path.join(ROOT, 'src', 'pages', '2__Prediction.py')
+INPUTS = 7  # brand, model, transmission, fuel, year, km, ownership
+
+
+def widget(elements, label):
+    return next(w for w in elements if w.label == label)
+
+
+def fragment_cpu():
+    return TELEMETRY.counter('span_cpu_seconds_total', span='valuation_fragment')
+
+
+def timed_run(at):
+    """(process CPU seconds, fragment CPU seconds) of one full script run."""
+    cpu, fragment = time.process_time(), fragment_cpu()
+    at.run()
+    return time.process_time() - cpu, fragment_cpu() - fragment
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cars', type=int, default=5, help="cars valued per session")
+    parser.add_argument('--repeats', type=int, default=5, help="idle reruns to average")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    at = AppTest.from_file(PAGE, default_timeout=300).run()
+    at.button[0].click().run()  # loads the model, explainer and caches
+    if at.exception:
+        raise SystemExit(at.exception[0].value)
+
+    idle = [timed_run(at) for _ in range(args.repeats)]
+    page_idle = statistics.median(cpu for cpu, _ in idle)
+    fragment_idle = statistics.median(fragment for _, fragment in idle)
+    chrome = page_idle - fragment_idle
+
+    cars = load_dataset().drop_duplicates(['Brand', 'Model_Only']).sample(args.cars, random_state=0)
+    submits = []
+    for car in cars.to_dict('records'):
+        widget(at.selectbox, "🏎️ Asset Brand").set_value(car['Brand']).run()
+        widget(at.selectbox, "📂 Model Series").set_value(car['Model_Only'])
+        widget(at.number_input, "📅 Vintage (Year)").set_value(min(max(2025 - int(car['Car Age']), 2010), 2024))
+        widget(at.number_input, "🛣️ Total Usage (KM)").set_value(min(max(int(car['KM Driven']), 100), 500000))
+        at.button[0].click()
+        submits.append(timed_run(at)[0])
+    page_submit = statistics.median(submits)
+
+    print(f"Full page run: {page_idle * 1000:.1f} ms CPU idle, {page_submit * 1000:.1f} ms CPU with a (cold) valuation")
+    print(f"  of which page chrome (background, CSS, resource lookups): {chrome * 1000:.1f} ms; "
+          f"input fragment: {fragment_idle * 1000:.1f} ms")
+
+    # Per car: every input change used to rerun the page; now only the brand pick and the submit do,
+    # and both rerun the fragment alone
+    before_runs, before_cpu = INPUTS + 1, INPUTS * page_idle + page_submit
+    after_runs, after_cpu = 2, fragment_idle + (page_submit - chrome)
+    print(f"\nSession of {args.cars} cars:")
+    print(f"  per-widget reruns: {before_runs * args.cars:>3} script runs, {before_cpu * args.cars:6.2f} s CPU")
+    print(f"  form + fragment:   {after_runs * args.cars:>3} script runs, {after_cpu * args.cars:6.2f} s CPU")
+    print(f"  saved:             {(before_runs - after_runs) * args.cars:>3} script runs, "
+          f"{(before_cpu - after_cpu) * args.cars:6.2f} s CPU")
+
+
+if __name__ == '__main__':
+    main()
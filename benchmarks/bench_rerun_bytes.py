@@ -0,0 +1,32 @@
+# Bytes of inline markdown/CSS each page pushes to the browser per rerun,
+# with data-URI backgrounds ("before") vs static compressed assets ("after").
+#
+#   python build_assets.py && python benchmarks/bench_rerun_bytes.py
+import os
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+PAGES = ['src/streamlit_app.py', 'src/pages/1__EDA_Dashboard.py', 'src/pages/2__Prediction.py']
+
+
+def rerun_bytes(page, static):
+    os.environ['CARVAULT_STATIC_ASSETS'] = '1' if static else '0'
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=120)
+    at.run()
+    return sum(len(m.value.encode()) for m in at.markdown)
+
+
+def main():
+    os.chdir(ROOT)
+    print(f"{'page':<34}{'before':>12}{'after':>12}")
+    for page in PAGES:
+        before, after = rerun_bytes(page, static=False), rerun_bytes(page, static=True)
+        print(f"{page:<34}{before / 1024:>10,.1f}KB{after / 1024:>10,.1f}KB")
+
+
+if __name__ == '__main__':
+    main()
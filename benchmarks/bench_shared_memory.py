@@ -0,0 +1,79 @@
+# Memory of N serving replicas on one host: each process loads the current model, its SHAP
+# explainer and the dataset, explains one car, then waits while the parent reads its RSS,
+# PSS (shared pages split between the processes mapping them) and private memory.
+#
+#   python benchmarks/bench_shared_memory.py --workers 4
+#
+# 'private' is the previous layout: explainer built on each process's heap, dataset copied
+# into pandas. 'shared' memory-maps both from files, as the app and API now do.
+import argparse
+import multiprocessing as mp
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from carvault.shared import process_memory
+
+CAR = {'KM Driven': 50000, 'Fuel Type': 'Petrol', 'Transmission Type': 'Manual', 'Ownership': 1,
+       'Brand': 'Maruti', 'Model_Only': 'Swift', 'Car Age': 5}
+
+
+def replica(mode, ready, done):
+    from carvault.dataset import load_dataset
+    from carvault.explain import explain_record
+    from carvault.inference import load_explainer
+    from carvault.registry import load_model
+    from carvault.shared import load_shared_explainer, shared_dataset
+
+    model = load_model(check=False)
+    if mode == 'shared':
+        explainer = load_shared_explainer(model.pipeline, model.explainer_path)
+        df = shared_dataset()
+    else:
+        explainer = load_explainer(model.pipeline)
+        df = load_dataset()
+    explain_record(model.predictor, explainer, CAR)
+    df.groupby('Brand', observed=True)['Selling Price (in Lakhs)'].median()
+    ready.put(os.getpid())
+    done.wait()
+
+
+def measure(mode, workers):
+    ctx = mp.get_context('spawn')  # separate interpreters, like uvicorn workers or Streamlit replicas
+    ready, done = ctx.Queue(), ctx.Event()
+    procs = [ctx.Process(target=replica, args=(mode, ready, done)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    pids = [ready.get(timeout=600) for _ in procs]
+    usage = [process_memory(pid) for pid in pids]
+    done.set()
+    for p in procs:
+        p.join()
+    return usage
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--modes', nargs='+', default=['private', 'shared'], choices=['private', 'shared'])
+    args = parser.parse_args()
+
+    # Build the shared explainer file up front so no replica pays for (or races on) writing it
+    if 'shared' in args.modes:
+        from carvault.registry import load_model
+        from carvault.shared import load_shared_explainer
+        model = load_model(check=False)
+        load_shared_explainer(model.pipeline, model.explainer_path)
+
+    mb = lambda n: n / 2**20  # noqa: E731
+    for mode in args.modes:
+        usage = measure(mode, args.workers)
+        print(f"{mode}: {args.workers} replicas")
+        for i, u in enumerate(usage):
+            print(f"  worker {i}: RSS {mb(u['rss']):6.0f} MB | PSS {mb(u['pss']):6.0f} MB | "
+                  f"private {mb(u['uss']):6.0f} MB | anonymous {mb(u['anonymous']):6.0f} MB")
+        print(f"  host total (sum of PSS): {mb(sum(u['pss'] for u in usage)):6.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
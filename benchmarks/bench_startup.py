@@ -0,0 +1,74 @@
+# Cold-start profile of each Streamlit page: time to first render in a fresh interpreter,
+# the second (warm) rerun, and the slowest imports the page itself triggers.
+#
+#   python benchmarks/bench_startup.py [--top 8]
+#
+# The Streamlit runtime is imported before the clock starts, as it is in a running server.
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+PAGES = ['src/streamlit_app.py', 'src/pages/1__EDA_Dashboard.py', 'src/pages/2__Prediction.py']
+MARKER = '--- page run ---'
+HEAVY = ['pandas', 'numpy', 'pyarrow', 'sklearn', 'joblib', 'shap', 'matplotlib', 'seaborn', 'xgboost']
+
+RUNNER = """
+import json, sys, time
+sys.path.insert(0, 'src')
+from streamlit.testing.v1 import AppTest
+print({marker!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+at = AppTest.from_file({page!r}, default_timeout=300).run()
+first = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+print(json.dumps({{
+    'first_render': first, 'rerun': rerun, 'errors': [str(e.value) for e in at.exception],
+    'loaded': sorted(m for m in {heavy!r} if m in sys.modules),
+}}))
+"""
+
+
+def slowest_imports(stderr, top):
+    """Top-level imports after the marker, by cumulative microseconds."""
+    lines = stderr.split(MARKER, 1)[-1].splitlines()
+    entries = []
+    for line in lines:
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        entries.append((len(name) - len(name.lstrip()), int(cumulative), name.strip()))
+    if not entries:
+        return []
+    base = min(depth for depth, _, _ in entries)
+    top_level = sorted(((us, name) for depth, us, name in entries if depth == base), reverse=True)
+    return top_level[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--top', type=int, default=8, help="slowest imports to list per page")
+    args = parser.parse_args()
+
+    for page in PAGES:
+        code = RUNNER.format(marker=MARKER, page=page, heavy=HEAVY)
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                              cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0 or not proc.stdout.strip():
+            print(f"{page}: failed\n{proc.stderr[-2000:]}")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{page}: first render {result['first_render'] * 1000:7.0f} ms | "
+              f"warm rerun {result['rerun'] * 1000:6.0f} ms | heavy modules: {', '.join(result['loaded']) or 'none'}")
+        for error in result['errors']:
+            print(f"    error: {error}")
+        for us, name in slowest_imports(proc.stderr, args.top):
+            print(f"    {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# Load test for the headless inference service (carvault.api).
+#
+#   uvicorn carvault.api:app --app-dir src --workers 4 --port 8000
+#   python benchmarks/load_test.py --url http://127.0.0.1:8000 --requests 2000 --concurrency 32
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+SAMPLE_CARS = [
+    {'KM Driven': 60660, 'Fuel Type': 'Diesel', 'Transmission Type': 'Manual', 'Ownership': 1,
+     'Brand': 'Maruti', 'Model_Only': 'Swift', 'Car Age': 10},
+    {'KM Driven': 150000, 'Fuel Type': 'Petrol', 'Transmission Type': 'Manual', 'Ownership': 2,
+     'Brand': 'Maruti', 'Model_Only': 'Swift Dzire', 'Car Age': 6},
+    {'KM Driven': 35000, 'Fuel Type': 'Petrol', 'Transmission Type': 'Auto', 'Ownership': 1,
+     'Brand': 'Hyundai', 'Model_Only': 'Creta', 'Car Age': 3},
+]
+
+
+def check_samples(url, endpoint):
+    """Fail fast unless every sample car is accepted, so rejections never pass for latency."""
+    with httpx.Client(base_url=url, timeout=60) as client:
+        for car in SAMPLE_CARS:
+            response = client.post(endpoint, json=[car] if endpoint == '/predict/batch' else car)
+            if response.status_code != 200:
+                raise SystemExit(f"Sample {car} returned {response.status_code}: {response.text}")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run(url, endpoint, total, concurrency, batch_size):
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    def payload():
+        if endpoint == '/predict/batch':
+            return [random.choice(SAMPLE_CARS) for _ in range(batch_size)]
+        return random.choice(SAMPLE_CARS)
+
+    async def worker(client):
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                response = await client.post(endpoint, json=payload())
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--endpoint', default='/predict', choices=['/predict', '/predict/batch', '/explain'])
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    check_samples(args.url, args.endpoint)
+    latencies, errors, elapsed = asyncio.run(
+        run(args.url, args.endpoint, args.requests, args.concurrency, args.batch_size))
+    if not latencies:
+        raise SystemExit(f"All {errors} requests failed")
+    ms = [l * 1000 for l in latencies]
+    print(f"Endpoint     : {args.endpoint}")
+    print(f"Requests     : {len(latencies)} ok, {errors} failed")
+    print(f"Concurrency  : {args.concurrency}")
+    print(f"Throughput   : {len(latencies) / elapsed:,.1f} req/s")
+    print(f"Latency p50  : {percentile(ms, 50):.2f} ms")
+    print(f"Latency p99  : {percentile(ms, 99):.2f} ms")
+    print(f"Latency mean : {statistics.mean(ms):.2f} ms")
+    if errors:
+        raise SystemExit(f"{errors} requests failed; the figures above are not comparable")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+# Pre-compress the page backgrounds into src/static/ so Streamlit serves them
+# as cached static files instead of re-sending base64 data URIs on every rerun,
+# and stage SHAP's JS bundle for the force-plot component.
+#
+#   python build_assets.py [--quality 75]
+import argparse
+import os
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from carvault.assets import BACKGROUNDS, COMPRESSED_FORMATS, STATIC_DIR
+from carvault.shap_force import BUNDLE_PATH, ensure_bundle
+
+PIL_FORMATS = {'webp': 'WEBP', 'jpg': 'JPEG'}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--quality', type=int, default=75)
+    parser.add_argument('--formats', nargs='+', default=list(COMPRESSED_FORMATS), choices=list(COMPRESSED_FORMATS))
+    args = parser.parse_args()
+
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    for png_file in BACKGROUNDS:
+        stem = os.path.splitext(os.path.basename(png_file))[0]
+        image = Image.open(png_file).convert('RGB')
+        for ext in args.formats:
+            out_path = os.path.join(STATIC_DIR, f"{stem}.{ext}")
+            image.save(out_path, PIL_FORMATS[ext], quality=args.quality, optimize=True)
+            print(f"{png_file} ({os.path.getsize(png_file) / 1024:,.0f} KB) -> "
+                  f"{out_path} ({os.path.getsize(out_path) / 1024:,.0f} KB)")
+
+    # SHAP's JS bundle, served once per session by the force-plot component
+    if ensure_bundle():
+        print(f"SHAP bundle staged at {BUNDLE_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# One-time conversion of the raw CSV into the typed, memory-mappable Arrow/Feather
+# artifact every loader reads, plus the precomputed EDA summary the pages display.
+#
+#   python convert_dataset.py [--csv src/cars24_cleaned.csv] [--out src/cars24.feather] [--summary src/cars24_summary.json]
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from carvault.dataset import CSV_PATH, DATA_PATH, PARTITIONS_DIR, convert_csv
+from carvault.ingest import BASE_HASHES
+from carvault.summary import SUMMARY_PATH, write_summary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--csv', default=CSV_PATH)
+    parser.add_argument('--out', default=DATA_PATH)
+    parser.add_argument('--summary', default=SUMMARY_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = convert_csv(args.csv, args.out)
+    print(f"Wrote {table.num_rows:,} rows x {table.num_columns} columns to {args.out} "
+          f"({os.path.getsize(args.out) / 1024:,.0f} KB, CSV {os.path.getsize(args.csv) / 1024:,.0f} KB) "
+          f"in {time.perf_counter() - start:.2f}s")
+    print(table.schema)
+
+    # The dedupe hashes of the old base artifact are stale now; ingest_listings.py recomputes them
+    base_hashes = os.path.join(PARTITIONS_DIR, BASE_HASHES)
+    if args.out == DATA_PATH and os.path.exists(base_hashes):
+        os.remove(base_hashes)
+
+    start = time.perf_counter()
+    summary = write_summary(args.out, args.summary)
+    print(f"Wrote EDA summary ({summary['rows']:,} rows, {len(summary['columns'])} columns) to "
+          f"{args.summary} ({os.path.getsize(args.summary) / 1024:,.0f} KB) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
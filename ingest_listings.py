@@ -0,0 +1,34 @@
+# Append a day's new listings to the dataset without rebuilding it.
+#
+#   python ingest_listings.py new_listings.csv [more.parquet ...]
+#
+# Rows are validated against the dataset schema, deduplicated against everything already
+# ingested, written as a new Arrow partition and folded into the EDA summary.
+# Follow with `python train_model.py --refresh` to grow the current model on the new partitions.
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from carvault.dataset import DATA_PATH, PARTITIONS_DIR
+from carvault.ingest import ingest
+from carvault.summary import SUMMARY_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest new listings as a dataset partition.")
+    parser.add_argument('sources', nargs='+', help="CSV or Parquet files of new listings")
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--partitions', default=PARTITIONS_DIR)
+    parser.add_argument('--summary', default=SUMMARY_PATH)
+    args = parser.parse_args()
+
+    for source in args.sources:
+        report = ingest(source, args.data, args.partitions, args.summary)
+        status = f"added as {report.partition}" if report.added else "nothing new"
+        print(f"{source}: {report.received:,} received, {report.invalid:,} invalid, "
+              f"{report.duplicates:,} duplicates, {report.added:,} {status} in {report.seconds:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# Nightly revaluation of a full inventory file with a pool of worker processes.
+#
+#   python score_inventory.py inventory.parquet valued.parquet --workers 8
+#
+# Workers share the registered model read-only (fork, or the memory-mapped compiled forest under spawn);
+# input is streamed in chunks and priced rows are written to disk in input order.
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from carvault.batch import DEFAULT_CHUNK_ROWS, default_workers, detect_format, score_file, score_file_parallel
+from carvault.explain import BatchExplainer
+from carvault.inference import INTERVAL_LEVEL
+from carvault.registry import REGISTRY_DIR, load_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price every row of a CSV/Parquet inventory file.")
+    parser.add_argument('source')
+    parser.add_argument('output', help="output path; .parquet or .csv decides the format")
+    parser.add_argument('--workers', type=int, default=default_workers(), help="scoring processes (1 = in-process)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--version', default=None, help="registry version (default: CURRENT)")
+    parser.add_argument('--registry', default=REGISTRY_DIR)
+    parser.add_argument('--interval', type=float, default=INTERVAL_LEVEL,
+                        help="price range level from the per-tree predictions (0 = no range columns)")
+    parser.add_argument('--explain', type=int, default=0, metavar='K',
+                        help="add each car's K largest SHAP price drivers (0 = off)")
+    parser.add_argument('--exact-shap', action='store_true',
+                        help="exact TreeSHAP instead of path attribution (much slower on deep forests)")
+    args = parser.parse_args()
+
+    if not 0 <= args.interval < 1:
+        parser.error("--interval must be in [0, 1)")
+    fmt, out_fmt = detect_format(args.source), detect_format(args.output)
+    if fmt != out_fmt:
+        parser.error("input and output must use the same format")
+    model = load_model(args.version, args.registry)
+    progress = lambda r: print(f"\r{r.rows:,} rows, {r.rows_per_sec:,.0f} rows/s", end='', flush=True)  # noqa: E731
+    with open(args.source, 'rb') as source:
+        if args.workers <= 1:
+            explain = BatchExplainer(model.pipeline, top_k=args.explain, exact=args.exact_shap) if args.explain else None
+            report = score_file(model.pipeline, source, args.output, fmt, args.chunk_rows, progress, model.options,
+                                args.interval, explain)
+        else:
+            report = score_file_parallel(model, source, args.output, fmt, args.workers, args.chunk_rows,
+                                         progress, model.options, args.registry, interval=args.interval,
+                                         top_k=args.explain, exact=args.exact_shap)
+    print(f"\nModel {model.version}: {report.scored:,} priced, {report.skipped:,} skipped, "
+          f"{report.unknown:,} unknown configurations in {report.seconds:.1f}s "
+          f"({report.rows_per_sec:,.0f} rows/s) -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
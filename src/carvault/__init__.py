@@ -0,0 +1 @@
+# Shared CarVault building blocks used by the Streamlit pages, training and batch tooling.
@@ -0,0 +1,162 @@
+# Headless inference service sharing the registered model with the Streamlit app.
+#
+#   uvicorn carvault.api:app --app-dir src --workers 4 --port 8000
+#
+# Each worker process loads the model once at startup; requests never touch Streamlit.
+# CARVAULT_MODEL_VERSION pins a registry version; otherwise CURRENT is watched and
+# newly promoted models are hot-swapped in the background.
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+from carvault.inference import INTERVAL_LEVEL, feature_names, predict_with_interval, records_frame
+from carvault.options import describe_unknown, known_mask
+from carvault.registry import load_model
+from carvault.reload import ModelWatcher, ServingModel
+from carvault.telemetry import TELEMETRY, cache_samples, span
+
+MAX_BATCH_RECORDS = int(os.environ.get('CARVAULT_MAX_BATCH', 10_000))
+
+_state = {}
+
+
+class CarFeatures(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    km_driven: float = Field(alias='KM Driven', ge=0)
+    fuel_type: str = Field(alias='Fuel Type')
+    transmission_type: str = Field(alias='Transmission Type')
+    ownership: int = Field(alias='Ownership', ge=0)
+    brand: str = Field(alias='Brand')
+    model_only: str = Field(alias='Model_Only')
+    car_age: float = Field(alias='Car Age', ge=0)
+
+
+def _frame(cars, serving):
+    records = [car.model_dump(by_alias=True) for car in cars]
+    try:
+        X = records_frame(records)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    options = serving.model.options
+    if options is not None:
+        known = known_mask(X, options)
+        if not known.all():
+            bad = np.flatnonzero(~known)[:20]
+            detail = {int(i): describe_unknown(records[i], options) for i in bad}
+            raise HTTPException(status_code=422, detail={'unknown_configurations': detail})
+    return X
+
+
+def _serving():
+    if 'watcher' in _state:
+        return _state['watcher'].current
+    if 'serving' not in _state:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    return _state['serving']
+
+
+@asynccontextmanager
+async def lifespan(app):
+    pinned = os.environ.get('CARVAULT_MODEL_VERSION')
+    if pinned:
+        with span('model_load'):
+            serving = _state['serving'] = ServingModel(load_model(pinned))
+        TELEMETRY.add_collector('explanations', lambda: cache_samples(
+            'explanations', serving.explanations.hits, serving.explanations.misses))
+    else:
+        # shap is heavy, so the explainer is only built on first use
+        _state['watcher'] = ModelWatcher(warm_explainer=False).start()
+    yield
+    if 'watcher' in _state:
+        _state['watcher'].stop()
+    _state.clear()
+
+
+app = FastAPI(title="CarVault Inference", lifespan=lifespan)
+
+
+@app.middleware('http')
+async def time_requests(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template, not raw path, so unknown URLs can't blow up the series count
+    route = getattr(request.scope.get('route'), 'path', 'unmatched')
+    TELEMETRY.observe(f'http {route}', time.perf_counter() - start)
+    TELEMETRY.inc('http_requests_total', route=route, status=response.status_code)
+    return response
+
+
+@app.get('/metrics', response_class=PlainTextResponse)
+def metrics():
+    """Span latency histograms, request/prediction counters and cache hit counts (Prometheus text format)."""
+    return PlainTextResponse(TELEMETRY.render_prometheus(), media_type='text/plain; version=0.0.4')
+
+
+@app.get('/health')
+def health():
+    if not _state:
+        return {'status': 'loading', 'model_version': None}
+    watcher = _state.get('watcher')
+    return {
+        'status': 'ok',
+        'model_version': _serving().version,
+        'reloads': watcher.reloads if watcher else 0,
+        'reload_error': watcher.last_error if watcher else None,
+    }
+
+
+# Prediction handlers are plain `def` so FastAPI runs them in its threadpool
+# and CPU-bound scoring never blocks the event loop.
+Level = Query(INTERVAL_LEVEL, gt=0, lt=1, description="central share of tree predictions inside the range")
+
+
+@app.post('/predict')
+def predict(car: CarFeatures, level: float = Level):
+    serving = _serving()
+    X = _frame([car], serving)
+    with span('predict'):
+        prices, lower, upper = predict_with_interval(serving.model.predictor, X, level)
+    TELEMETRY.inc('predicted_rows_total', 1, source='api')
+    response = {'price': round(float(prices[0]), 4)}
+    if lower is not None:
+        response['interval'] = {'level': level, 'lower': round(float(lower[0]), 4), 'upper': round(float(upper[0]), 4)}
+    return response
+
+
+@app.post('/predict/batch')
+def predict_batch(cars: List[CarFeatures], level: float = Level):
+    if not cars:
+        return {'prices': []}
+    if len(cars) > MAX_BATCH_RECORDS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_RECORDS} records")
+    serving = _serving()
+    X = _frame(cars, serving)
+    with span('predict_batch'):
+        prices, lower, upper = predict_with_interval(serving.model.predictor, X, level)
+    TELEMETRY.inc('predicted_rows_total', len(cars), source='api')
+    response = {'prices': np.round(prices, 4).tolist()}
+    if lower is not None:
+        response['intervals'] = {'level': level, 'lower': np.round(lower, 4).tolist(),
+                                 'upper': np.round(upper, 4).tolist()}
+    return response
+
+
+@app.post('/explain')
+def explain_one(car: CarFeatures):
+    serving = _serving()
+    X = _frame([car], serving)
+    explanation = serving.explain(X.iloc[0].to_dict())
+    names = feature_names(serving.model.preprocessor)
+    contributions = {name: float(v) for name, v in zip(names, explanation.shap_values) if v != 0.0}
+    return {
+        'price': round(explanation.price, 4),
+        'base_value': explanation.base_value,
+        'contributions': dict(sorted(contributions.items(), key=lambda kv: -abs(kv[1]))),
+    }
@@ -0,0 +1,83 @@
+# Shared background-image and CSS helpers for every page.
+#
+# Encoded assets are memoized per process, and when `python build_assets.py`
+# has produced compressed copies in src/static/ (served by Streamlit's static
+# file handler) the CSS references them by URL instead of inlining ~1 MB of
+# base64 on every rerun.
+import base64
+import functools
+import os
+
+import streamlit as st
+
+from carvault.telemetry import span
+
+STYLE_DIR = 'src/styles'
+STATIC_DIR = 'src/static'
+STATIC_URL = 'app/static'
+COMPRESSED_FORMATS = ('webp', 'jpg')
+BACKGROUNDS = ['src/hero_car.png', 'src/bg_eda_v2.png', 'src/bg_prediction_v2.png']
+
+
+# Function to get base64 of image for CSS
+@functools.lru_cache(maxsize=None)
+def get_base64(bin_file):
+    with open(bin_file, 'rb') as f:
+        data = f.read()
+    return base64.b64encode(data).decode()
+
+
+def static_serving_enabled():
+    try:
+        return bool(st.get_option('server.enableStaticServing'))
+    except Exception:
+        return False
+
+
+def compressed_asset(png_file):
+    stem = os.path.splitext(os.path.basename(png_file))[0]
+    for ext in COMPRESSED_FORMATS:
+        if os.path.exists(os.path.join(STATIC_DIR, f"{stem}.{ext}")):
+            return f"{stem}.{ext}"
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def background_url(png_file, static=True):
+    asset = compressed_asset(png_file) if static else None
+    if asset is not None:
+        return f"{STATIC_URL}/{asset}"
+    return f"data:image/png;base64,{get_base64(png_file)}"
+
+
+def background_css(png_file, static=None):
+    if static is None:
+        static = static_serving_enabled() and os.environ.get('CARVAULT_STATIC_ASSETS', '1') != '0'
+    return f'''
+    <style>
+    .stApp {{
+        background-image: url("{background_url(png_file, static)}");
+        background-size: cover;
+        background-position: center;
+        background-attachment: fixed;
+    }}
+    </style>
+    '''
+
+
+def set_bg(png_file):
+    with span('assets'):
+        st.markdown(background_css(png_file), unsafe_allow_html=True)
+
+
+@functools.lru_cache(maxsize=None)
+def read_css(name):
+    with open(os.path.join(STYLE_DIR, f"{name}.css")) as f:
+        return f.read()
+
+
+def inject_css(*names):
+    # Shared base rules first, then the page-specific sheet
+    with span('assets'):
+        css = '\n'.join(read_css(name) for name in names)
+        st.markdown(f"<style>\n{css}</style>", unsafe_allow_html=True)
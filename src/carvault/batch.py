@@ -0,0 +1,266 @@
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from carvault.features import FEATURES, missing_features, prepare_features
+from carvault.inference import INTERVAL_LEVEL, predict_with_interval
+from carvault.options import known_mask
+
+DEFAULT_CHUNK_ROWS = 50_000
+PRICE_COLUMN = 'Predicted Price (in Lakhs)'
+LOWER_COLUMN = 'Price Range Low (in Lakhs)'
+UPPER_COLUMN = 'Price Range High (in Lakhs)'
+KNOWN_COLUMN = 'Known Configuration'
+
+
+@dataclass
+class BatchReport:
+    rows: int = 0
+    scored: int = 0
+    skipped: int = 0
+    unknown: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def detect_format(filename):
+    return 'parquet' if str(filename).lower().endswith(('.parquet', '.pq')) else 'csv'
+
+
+def read_columns(source, fmt):
+    # Only the header/schema is read here, the body is streamed later
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        columns = pq.ParquetFile(source).schema_arrow.names
+    else:
+        columns = list(pd.read_csv(source, nrows=0).columns)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return [str(c).strip() for c in columns]
+
+
+def iter_chunks(source, fmt, chunk_rows=DEFAULT_CHUNK_ROWS):
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        for chunk in pd.read_csv(source, chunksize=chunk_rows):
+            chunk.columns = chunk.columns.str.strip()
+            yield chunk
+
+
+def price_chunk(pipeline, chunk, options=None, interval=INTERVAL_LEVEL, explain=None):
+    """Output columns (NaN where features are unusable) and the known-configuration mask for one chunk.
+
+    With `interval` set, forest models also get a price range from the same pass over the trees;
+    with `explain` (a BatchExplainer), each car gets its top SHAP price drivers.
+    """
+    X, valid = prepare_features(chunk)
+    found = {}
+    if valid.any():
+        rows = X[valid].astype(object)
+        if interval:
+            prices, lower, upper = predict_with_interval(pipeline, rows, interval)
+        else:
+            prices, lower, upper = pipeline.predict(rows), None, None
+        found[PRICE_COLUMN] = np.round(prices, 2)
+        if lower is not None:
+            found[LOWER_COLUMN], found[UPPER_COLUMN] = np.round(lower, 2), np.round(upper, 2)
+        if explain is not None:
+            found.update(explain.top_columns(rows))
+    columns = {PRICE_COLUMN: np.full(len(chunk), np.nan)}
+    for name, values in found.items():
+        columns[name] = np.full(len(chunk), np.nan if values.dtype.kind == 'f' else None, dtype=values.dtype)
+        columns[name][valid] = values
+    # Unseen brands/models are still priced, but flagged for review
+    known = known_mask(X, options) & valid if options is not None else None
+    return columns, known, int(valid.sum())
+
+
+def _attach(chunk, columns, known):
+    priced = chunk.copy()
+    for name, values in columns.items():
+        priced[name] = values
+    if known is not None:
+        priced[KNOWN_COLUMN] = known
+    return priced
+
+
+def score_chunk(pipeline, chunk, options=None, interval=INTERVAL_LEVEL, explain=None):
+    columns, known, scored = price_chunk(pipeline, chunk, options, interval, explain)
+    unknown = scored - int(known.sum()) if known is not None else 0
+    return _attach(chunk, columns, known), scored, unknown
+
+
+class _ChunkWriter:
+    def __init__(self, out_path, fmt):
+        self.out_path = out_path
+        self.fmt = fmt
+        self._parquet = None
+        self._csv = None
+
+    def write(self, frame):
+        if self.fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.out_path, table.schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        else:
+            header = self._csv is None
+            if header:
+                self._csv = open(self.out_path, 'w', newline='')
+            frame.to_csv(self._csv, header=header, index=False)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._csv is not None:
+            self._csv.close()
+
+
+def score_file(pipeline, source, out_path, fmt='csv', chunk_rows=DEFAULT_CHUNK_ROWS, progress=None, options=None,
+               interval=INTERVAL_LEVEL, explain=None):
+    """Stream `source` through the pipeline chunk by chunk and write priced rows to `out_path`.
+
+    Memory stays bounded by `chunk_rows` regardless of the file size.
+    """
+    missing = missing_features(read_columns(source, fmt))
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    report = BatchReport()
+    writer = _ChunkWriter(out_path, fmt)
+    start = time.perf_counter()
+    try:
+        for chunk in iter_chunks(source, fmt, chunk_rows):
+            priced, scored, unknown = score_chunk(pipeline, chunk, options, interval, explain)
+            writer.write(priced)
+            report.rows += len(chunk)
+            report.scored += scored
+            report.skipped += len(chunk) - scored
+            report.unknown += unknown
+            report.seconds = time.perf_counter() - start
+            if progress is not None:
+                progress(report)
+    finally:
+        writer.close()
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+# --- Multi-process scoring ---
+# Workers hold the model in a module global. With the 'fork' start method they inherit the
+# parent's already-loaded copy (shared copy-on-write pages). Spawned workers would each unpickle
+# the sklearn trees onto their own heap, so for forests they score from the compiled node
+# arrays and the SHAP explainer instead, both memory-mapped and held once in the page cache.
+# Other models (XGBoost, legacy pickles) are loaded in full by every spawned worker.
+_worker = {}
+
+
+def _init_worker(version, registry_dir, options, interval, top_k, exact, mapped=None):
+    if 'pipeline' not in _worker and mapped is not None:
+        import joblib
+        from carvault.forest import CompiledForest, CompiledPipeline
+        preprocessor, forest_path, explainer_path = mapped
+        _worker['pipeline'] = CompiledPipeline.forest_only(preprocessor, CompiledForest.load(forest_path, mmap_mode='r'))
+        if top_k:
+            from carvault.explain import BatchExplainer
+            explainer = joblib.load(explainer_path, mmap_mode='r')
+            _worker['explain'] = BatchExplainer(_worker['pipeline'], explainer, top_k=top_k, exact=exact)
+    if 'pipeline' not in _worker:
+        from carvault.registry import load_model
+        model = load_model(version, registry_dir, check=False)
+        _worker['pipeline'] = model.pipeline
+        if top_k and 'explain' not in _worker:
+            from carvault.explain import BatchExplainer
+            from carvault.shared import load_shared_explainer
+            explainer = load_shared_explainer(model.pipeline, model.explainer_path)
+            _worker['explain'] = BatchExplainer(model.pipeline, explainer, top_k=top_k, exact=exact)
+    _worker['options'] = options
+    _worker['interval'] = interval
+
+
+def _price_in_worker(chunk):
+    return price_chunk(_worker['pipeline'], chunk, _worker['options'], _worker['interval'], _worker.get('explain'))
+
+
+def default_workers():
+    return len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+
+def score_file_parallel(model, source, out_path, fmt='csv', workers=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                        progress=None, options=None, registry_dir=None, start_method=None, interval=INTERVAL_LEVEL,
+                        top_k=0, exact=False):
+    """Like `score_file`, but shards are priced by a pool of `workers` processes sharing `model`
+    (a registry LoadedModel) read-only. The parent streams chunks in and writes results in input
+    order; at most 2 shards per worker are in flight, so memory stays bounded.
+
+    `top_k` > 0 adds each car's largest SHAP price drivers, computed in the workers."""
+    from carvault.registry import REGISTRY_DIR
+    missing = missing_features(read_columns(source, fmt))
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    workers = workers or default_workers()
+    if start_method is None:
+        start_method = 'fork' if 'fork' in mp.get_all_start_methods() else 'spawn'
+    ctx = mp.get_context(start_method)
+    mapped = None
+    if start_method == 'fork':
+        # Loaded before the pool exists, so every worker inherits the same pages
+        _worker['pipeline'] = model.pipeline
+        if top_k:
+            from carvault.explain import BatchExplainer
+            from carvault.shared import load_shared_explainer
+            explainer = load_shared_explainer(model.pipeline, model.explainer_path)
+            _worker['explain'] = BatchExplainer(model.pipeline, explainer, top_k=top_k, exact=exact)
+    elif model.forest_path is not None:
+        if top_k:
+            from carvault.shared import load_shared_explainer
+            load_shared_explainer(model.pipeline, model.explainer_path)  # written once here, mapped by the workers
+        if not top_k or os.path.exists(model.explainer_path):
+            mapped = (model.preprocessor, model.forest_path, model.explainer_path)
+
+    report = BatchReport()
+    writer = _ChunkWriter(out_path, fmt)
+    start = time.perf_counter()
+    pending = deque()
+
+    def drain_one():
+        chunk, result = pending.popleft()
+        columns, known, scored = result.get()
+        writer.write(_attach(chunk, columns, known))
+        report.rows += len(chunk)
+        report.scored += scored
+        report.skipped += len(chunk) - scored
+        report.unknown += scored - int(known.sum()) if known is not None else 0
+        report.seconds = time.perf_counter() - start
+        if progress is not None:
+            progress(report)
+
+    try:
+        initargs = (model.version, registry_dir or REGISTRY_DIR, options, interval, top_k, exact, mapped)
+        with ctx.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+            for chunk in iter_chunks(source, fmt, chunk_rows):
+                # Only the feature columns cross the process boundary; prices come back as arrays
+                pending.append((chunk, pool.apply_async(_price_in_worker, (chunk[FEATURES],))))
+                if len(pending) >= 2 * workers:
+                    drain_one()
+            while pending:
+                drain_one()
+    finally:
+        writer.close()
+        _worker.clear()
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,59 @@
+import functools
+import threading
+from collections import defaultdict
+
+from carvault.telemetry import cache_samples
+
+
+class CacheStats:
+    """Process-wide call/miss counters for memoized functions (hits = calls - misses)."""
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.misses = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def call(self, name):
+        with self._lock:
+            self.calls[name] += 1
+
+    def miss(self, name):
+        with self._lock:
+            self.misses[name] += 1
+
+    def hits(self, name):
+        return self.calls[name] - self.misses[name]
+
+    def hit_rate(self, name):
+        return self.hits(name) / self.calls[name] if self.calls[name] else 0.0
+
+    def summary(self):
+        return {name: (self.hits(name), self.misses[name]) for name in sorted(self.calls)}
+
+    def samples(self):
+        """Hit/miss counters per cache, for `TELEMETRY.add_collector`."""
+        return [s for name, (hits, misses) in self.summary().items() for s in cache_samples(name, hits, misses)]
+
+    def counted(self, cache_decorator):
+        """Wrap a caching decorator (e.g. st.cache_data(...)) so its hits and misses are counted.
+
+        The undecorated body only runs on a miss, so it records the miss; the outer wrapper records every call.
+        """
+        def decorate(fn):
+            name = fn.__name__
+
+            @functools.wraps(fn)
+            def body(*args, **kwargs):
+                self.miss(name)
+                return fn(*args, **kwargs)
+
+            cached = cache_decorator(body)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                self.call(name)
+                return cached(*args, **kwargs)
+
+            wrapper.clear = getattr(cached, 'clear', None)
+            return wrapper
+        return decorate
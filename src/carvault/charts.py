@@ -0,0 +1,167 @@
+# Vega-Lite specs for the EDA dashboard.
+#
+# Every chart is drawn client-side from a fixed-size table (histogram bins, 2-D density
+# cells, per-category quantiles, a correlation matrix) that summary.py derives from the
+# precomputed aggregates. Payload and render time depend on the number of bins, not the
+# number of rows.
+from carvault.lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+HIST_BINS = 30
+DENSITY_BINS = 60
+TOP_CATEGORIES = 15
+
+PRIMARY = '#00d2ff'
+SECONDARY = '#92fe9d'
+PANEL = '#1e293b'
+
+
+def is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype)
+
+
+# --- Vega-Lite specs ---
+def _spec(title, layers_or_mark, height=420):
+    spec = {
+        'title': {'text': title, 'color': 'white', 'fontSize': 18},
+        'height': height,
+        'background': PANEL,
+        'config': {
+            'view': {'stroke': None},
+            'axis': {'labelColor': '#cbd5e1', 'titleColor': '#cbd5e1', 'gridColor': '#334155', 'domainColor': '#475569'},
+            'legend': {'labelColor': '#cbd5e1', 'titleColor': '#cbd5e1'},
+        },
+    }
+    spec.update(layers_or_mark)
+    return spec
+
+
+def histogram_spec(feature, with_density=True):
+    bars = {
+        'data': {'name': 'hist'},
+        'mark': {'type': 'bar', 'color': PRIMARY, 'opacity': 0.8},
+        'encoding': {
+            'x': {'field': 'start', 'type': 'quantitative', 'bin': {'binned': True}, 'title': feature},
+            'x2': {'field': 'end'},
+            'y': {'field': 'count', 'type': 'quantitative', 'title': 'Count'},
+            'tooltip': [{'field': 'start', 'format': ',.2f'}, {'field': 'end', 'format': ',.2f'}, {'field': 'count'}],
+        },
+    }
+    if not with_density:
+        return _spec(f"Distribution of {feature}", bars)
+    curve = {
+        'data': {'name': 'density'},
+        'mark': {'type': 'line', 'color': 'white', 'strokeWidth': 2},
+        'encoding': {'x': {'field': 'x', 'type': 'quantitative'}, 'y': {'field': 'density', 'type': 'quantitative'}},
+    }
+    return _spec(f"Distribution of {feature}", {'layer': [bars, curve]})
+
+
+def bar_spec(feature):
+    return _spec(f"Distribution of {feature}", {
+        'mark': {'type': 'bar', 'color': PRIMARY},
+        'encoding': {
+            'x': {'field': 'category', 'type': 'nominal', 'sort': '-y', 'title': feature},
+            'y': {'field': 'count', 'type': 'quantitative', 'title': 'Count'},
+            'tooltip': [{'field': 'category'}, {'field': 'count'}],
+        },
+    })
+
+
+def density_spec(x_feature, y_feature):
+    return _spec(f"{x_feature} vs {y_feature}", {
+        'mark': {'type': 'rect'},
+        'encoding': {
+            'x': {'field': 'x_start', 'type': 'quantitative', 'title': x_feature},
+            'x2': {'field': 'x_end'},
+            'y': {'field': 'y_start', 'type': 'quantitative', 'title': y_feature},
+            'y2': {'field': 'y_end'},
+            'color': {'field': 'count', 'type': 'quantitative', 'scale': {'scheme': 'viridis', 'type': 'log'}, 'title': 'Cars'},
+            'tooltip': [{'field': 'x_start', 'title': x_feature, 'format': ',.2f'},
+                        {'field': 'y_start', 'title': y_feature, 'format': ',.2f'}, {'field': 'count'}],
+        },
+    })
+
+
+def box_spec(category_feature, value_feature, horizontal=False):
+    cat = {'field': 'category', 'type': 'nominal', 'sort': None, 'title': category_feature}
+    val = lambda field, **kw: {'field': field, 'type': 'quantitative', **kw}  # noqa: E731
+    c, v = ('y', 'x') if horizontal else ('x', 'y')
+    return _spec(f"{category_feature} vs {value_feature}", {'layer': [
+        {'mark': {'type': 'rule', 'color': SECONDARY},
+         'encoding': {c: cat, v: val('min', title=value_feature), f'{v}2': {'field': 'max'}}},
+        {'mark': {'type': 'bar', 'color': SECONDARY, 'opacity': 0.7, 'size': 14},
+         'encoding': {c: cat, v: val('q1'), f'{v}2': {'field': 'q3'},
+                      'tooltip': [{'field': 'category'}, {'field': 'median', 'format': ',.2f'}, {'field': 'count'}]}},
+        {'mark': {'type': 'tick', 'color': 'white', 'size': 14},
+         'encoding': {c: cat, v: val('median')}},
+    ]})
+
+
+def crosstab_spec(x_feature, y_feature):
+    return _spec(f"{x_feature} vs {y_feature}", {
+        'mark': {'type': 'rect'},
+        'encoding': {
+            'x': {'field': 'x', 'type': 'nominal', 'title': x_feature},
+            'y': {'field': 'y', 'type': 'nominal', 'title': y_feature},
+            'color': {'field': 'count', 'type': 'quantitative', 'scale': {'scheme': 'viridis'}, 'title': 'Cars'},
+            'tooltip': [{'field': 'x'}, {'field': 'y'}, {'field': 'count'}],
+        },
+    })
+
+
+def heatmap_spec():
+    cell = {'x': {'field': 'x', 'type': 'nominal', 'title': None, 'sort': None},
+            'y': {'field': 'y', 'type': 'nominal', 'title': None, 'sort': None}}
+    return _spec("Correlation Matrix", {'layer': [
+        {'mark': 'rect',
+         'encoding': {**cell, 'color': {'field': 'corr', 'type': 'quantitative',
+                                        'scale': {'scheme': 'blues', 'domain': [-1, 1]}, 'title': 'r'}}},
+        {'mark': {'type': 'text', 'fontWeight': 'bold', 'fontSize': 13},
+         'encoding': {**cell, 'text': {'field': 'corr', 'type': 'quantitative', 'format': '.2f'},
+                      'color': {'condition': {'test': 'abs(datum.corr) > 0.5', 'value': 'white'}, 'value': '#0f172a'}}},
+    ]}, height=520)
+
+
+def curves_spec(title, x_field, y_field, color_field, marker=None):
+    """One line per `color_field` value; `marker` draws a dashed rule at that x (e.g. the car's own age)."""
+    lines = {
+        'mark': {'type': 'line', 'point': True, 'strokeWidth': 2},
+        'encoding': {
+            'x': {'field': x_field, 'type': 'quantitative'},
+            'y': {'field': y_field, 'type': 'quantitative'},
+            'color': {'field': color_field, 'type': 'nominal', 'sort': None, 'scale': {'scheme': 'tableau10'}},
+            'tooltip': [{'field': color_field}, {'field': x_field}, {'field': y_field, 'format': ',.2f'}],
+        },
+    }
+    if marker is None:
+        return _spec(title, lines, height=360)
+    rule = {
+        'data': {'values': [{x_field: marker}]},
+        'mark': {'type': 'rule', 'color': 'white', 'strokeDash': [4, 4], 'opacity': 0.6},
+        'encoding': {'x': {'field': x_field, 'type': 'quantitative'}},
+    }
+    return _spec(title, {'layer': [lines, rule]}, height=360)
+
+
+def bivariate_kind(x_numeric, y_numeric):
+    if x_numeric and y_numeric:
+        return 'density'
+    if y_numeric:
+        return 'box'
+    if x_numeric:
+        return 'box_h'
+    return 'crosstab'
+
+
+def bivariate_spec(kind, x_feature, y_feature):
+    if kind == 'density':
+        return density_spec(x_feature, y_feature)
+    if kind == 'box':
+        return box_spec(x_feature, y_feature)
+    if kind == 'box_h':
+        spec = box_spec(y_feature, x_feature, horizontal=True)
+        spec['title']['text'] = f"{x_feature} vs {y_feature}"
+        return spec
+    return crosstab_spec(x_feature, y_feature)
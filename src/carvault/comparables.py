@@ -0,0 +1,77 @@
+# Comparable listings: the closest real cars of the same Brand/Model_Only to a query car.
+#
+# Listings are sorted by (Brand, Model_Only) so every model owns one contiguous slice, and
+# each slice gets its own KD-tree over the standardized Car Age, KM Driven and Ownership.
+# A query is one dict lookup plus a search in a tree of a few hundred points at most. The
+# index is registered next to the model (comparables.joblib), so workers load it instead of
+# rebuilding it.
+import joblib
+import numpy as np
+
+from carvault.features import FEATURES, TARGET
+
+DISTANCE_FEATURES = ['Car Age', 'KM Driven', 'Ownership']
+LISTING_COLUMNS = FEATURES + [TARGET]
+TOP_K = 5
+
+
+def _key(brand, model):
+    return f"{brand}\x1f{model}"
+
+
+class ComparablesIndex:
+    def __init__(self, listings, points, scale, slices, trees):
+        self.listings = listings  # listing rows, sorted by Brand/Model_Only
+        self.points = points  # standardized DISTANCE_FEATURES, row-aligned with `listings`
+        self.scale = scale
+        self.slices = slices  # "brand\x1fmodel" -> (start, stop) into listings/points
+        self.trees = trees  # same keys -> KDTree over points[start:stop]
+
+    @classmethod
+    def from_frame(cls, df, leaf_size=16):
+        from sklearn.neighbors import KDTree
+
+        listings = df[LISTING_COLUMNS].dropna().sort_values(['Brand', 'Model_Only'], kind='stable')
+        listings = listings.reset_index(drop=True)
+        raw = listings[DISTANCE_FEATURES].to_numpy(dtype=np.float64)
+        scale = raw.std(axis=0)
+        scale[scale == 0] = 1.0
+        points = raw / scale
+
+        brands = listings['Brand'].astype(str).to_numpy()
+        models = listings['Model_Only'].astype(str).to_numpy()
+        change = np.flatnonzero((brands[1:] != brands[:-1]) | (models[1:] != models[:-1])) + 1
+        bounds = np.concatenate([[0], change, [len(listings)]])
+        slices, trees = {}, {}
+        for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            key = _key(brands[start], models[start])
+            slices[key] = (start, stop)
+            trees[key] = KDTree(points[start:stop], leaf_size=leaf_size)
+        return cls(listings, points, scale, slices, trees)
+
+    def __len__(self):
+        return len(self.listings)
+
+    def nearest(self, record, k=TOP_K):
+        """(row positions into `listings`, distances) of up to k comparables, closest first."""
+        key = _key(record['Brand'], record['Model_Only'])
+        tree = self.trees.get(key)
+        if tree is None:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        start, stop = self.slices[key]
+        query = np.array([[float(record[c]) for c in DISTANCE_FEATURES]]) / self.scale
+        distances, positions = tree.query(query, k=min(k, stop - start))
+        return positions[0] + start, distances[0]
+
+    def query(self, record, k=TOP_K):
+        """The k closest listings of the same Brand/Model_Only, with a 'Distance' column."""
+        positions, distances = self.nearest(record, k)
+        rows = self.listings.iloc[positions].reset_index(drop=True)
+        return rows.assign(Distance=distances)
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        return joblib.load(path, mmap_mode=mmap_mode)
@@ -0,0 +1,89 @@
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from carvault.features import normalize_columns
+from carvault.lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+CSV_PATH = 'src/cars24_cleaned.csv'
+DATA_PATH = 'src/cars24.feather'
+# Appended listings: one Arrow file per ingest run, listed in the manifest (the commit point)
+PARTITIONS_DIR = 'src/cars24_partitions'
+MANIFEST_FILE = 'manifest.json'
+
+# Fixed on-disk schema: narrow integers, dictionary-encoded categoricals, float64 target
+SCHEMA = pa.schema([
+    ('KM Driven', pa.int32()),
+    ('Fuel Type', pa.dictionary(pa.int8(), pa.string())),
+    ('Transmission Type', pa.dictionary(pa.int8(), pa.string())),
+    ('Ownership', pa.int8()),
+    ('Selling Price (in Lakhs)', pa.float64()),
+    ('Brand', pa.dictionary(pa.int16(), pa.string())),
+    ('Model_Only', pa.dictionary(pa.int16(), pa.string())),
+    ('Car Age', pa.int16()),
+])
+COLUMNS = SCHEMA.names
+
+
+def table_from_csv(csv_path=CSV_PATH):
+    """Parse the raw CSV once, repair its header and cast it to SCHEMA."""
+    df = normalize_columns(pd.read_csv(csv_path))
+    df = df.drop(columns=['index'], errors='ignore')[COLUMNS]
+    return pa.Table.from_pandas(df, preserve_index=False).cast(SCHEMA)
+
+
+def convert_csv(csv_path=CSV_PATH, out_path=DATA_PATH):
+    table = table_from_csv(csv_path)
+    # Uncompressed Arrow IPC in a single record batch, so readers can memory-map it and wrap the
+    # columns without decoding or copying (see carvault.shared)
+    table = table.combine_chunks()
+    feather.write_feather(table, out_path, compression='uncompressed', chunksize=max(table.num_rows, 1))
+    return table
+
+
+def list_partitions(partitions_dir=PARTITIONS_DIR):
+    """Committed partitions, oldest first: [{'name', 'rows', ...}, ...]."""
+    try:
+        with open(os.path.join(partitions_dir, MANIFEST_FILE)) as f:
+            return json.load(f)['partitions']
+    except FileNotFoundError:
+        return []
+
+
+def _read_ipc(path):
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def read_partitions(names, partitions_dir=PARTITIONS_DIR, columns=None):
+    tables = [_read_ipc(os.path.join(partitions_dir, f"{name}.feather")) for name in names]
+    table = pa.concat_tables(tables).unify_dictionaries() if tables else SCHEMA.empty_table()
+    return table.select(columns) if columns else table
+
+
+def read_table(path=DATA_PATH, columns=None, partitions_dir=PARTITIONS_DIR):
+    """The base artifact plus every committed partition (pass partitions_dir=None for the base only)."""
+    table = _read_ipc(path) if os.path.exists(path) else table_from_csv()
+    names = [part['name'] for part in list_partitions(partitions_dir)] if partitions_dir else []
+    if names:
+        table = pa.concat_tables([table, read_partitions(names, partitions_dir)]).unify_dictionaries()
+    return table.select(columns) if columns else table
+
+
+def load_dataset(path=DATA_PATH, columns=None):
+    """Typed DataFrame from the columnar artifact, falling back to converting the CSV in memory."""
+    return read_table(path, columns).to_pandas()
+
+
+def dataset_fingerprint(path=DATA_PATH, partitions_dir=PARTITIONS_DIR):
+    """O(1) version key for cache lookups: the artifact's path, size and mtime (or the CSV's when it is missing),
+    plus the number of committed partitions."""
+    source = path if os.path.exists(path) else CSV_PATH
+    stat = os.stat(source)
+    fingerprint = f"{os.path.basename(source)}:{stat.st_size}:{stat.st_mtime_ns}"
+    partitions = list_partitions(partitions_dir)
+    return f"{fingerprint}+{len(partitions)}:{partitions[-1]['name']}" if partitions else fingerprint
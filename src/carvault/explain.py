@@ -0,0 +1,164 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from carvault.features import FEATURES, NUMERIC_FEATURES
+from carvault.forest import DENSE_CHUNK_ROWS
+from carvault.inference import dense_rows, load_explainer, predict_transformed, records_frame, transform_features
+from carvault.telemetry import span
+
+DEFAULT_CACHE_SIZE = 4096
+TOP_K = 3
+
+
+@dataclass(frozen=True)
+class Explanation:
+    price: float
+    base_value: float
+    shap_values: np.ndarray  # one SHAP value per transformed column
+    row: np.ndarray  # the transformed feature row the SHAP values refer to
+
+
+def record_key(record):
+    """Normalize a feature dict so equivalent inputs (1 vs 1.0, stray spaces) share a cache entry."""
+    key = []
+    for col in FEATURES:
+        value = record[col]
+        key.append(float(value) if col in NUMERIC_FEATURES else str(value).strip())
+    return tuple(key)
+
+
+class ExplanationCache:
+    """Thread-safe LRU of prediction + SHAP vector keyed on the normalized input tuple."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, explanation):
+        with self._lock:
+            self._entries[key] = explanation
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def explain_record(predictor, explainer, record, cache=None):
+    """Price and SHAP vector for one car, transforming the row only once."""
+    key = record_key(record)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    X = records_frame([dict(zip(FEATURES, key))])
+    with span('transform'):
+        row = transform_features(predictor, X)
+    with span('predict'):
+        price = float(predict_transformed(predictor, row)[0])
+    with span('shap_values'):
+        shap_values = np.asarray(explainer.shap_values(row))[0]
+    explanation = Explanation(
+        price=price,
+        base_value=float(np.ravel(explainer.expected_value)[0]),
+        shap_values=shap_values,
+        row=dense_rows(row)[0],
+    )
+    if cache is not None:
+        cache.put(key, explanation)
+    return explanation
+
+
+def explain_records(predictor, explainer, records):
+    """explain_record for many cars at once: one transform, predict and exact shap_values call.
+
+    Row for row identical to explain_record, so the results can be served from the same cache.
+    """
+    X = records_frame([dict(zip(FEATURES, record_key(record))) for record in records])
+    rows = transform_features(predictor, X)
+    prices = predict_transformed(predictor, rows)
+    shap_values = np.asarray(explainer.shap_values(rows))
+    base_value = float(np.ravel(explainer.expected_value)[0])
+    return [Explanation(price=float(price), base_value=base_value, shap_values=values, row=row)
+            for price, values, row in zip(prices, shap_values, dense_rows(rows))]
+
+
+# --- Batch explanations ---
+def feature_groups(preprocessor):
+    """(n_transformed, n_features) 0/1 matrix folding one-hot SHAP columns back onto FEATURES."""
+    owners = []
+    for _, transformer, columns in preprocessor.transformers_:
+        if transformer == 'drop' or not len(columns):
+            continue
+        names = transformer.get_feature_names_out(columns) if hasattr(transformer, 'get_feature_names_out') else columns
+        for name in names:
+            # One-hot outputs are named '<column>_<category>'; match the longest column prefix
+            owner = max((c for c in columns if name == c or name.startswith(f"{c}_")), key=len)
+            owners.append(FEATURES.index(owner))
+    groups = np.zeros((len(owners), len(FEATURES)))
+    groups[np.arange(len(owners)), owners] = 1.0
+    return groups
+
+
+class BatchExplainer:
+    """Per-row SHAP contributions of the seven input features for whole chunks of cars.
+
+    Exact TreeSHAP grows with tree depth and is far too slow for fully grown forests over
+    large files, so batches default to shap's path attribution (`approximate=True`), which
+    is still additive: base value + contributions = predicted price.
+    """
+
+    def __init__(self, predictor, explainer=None, top_k=TOP_K, exact=False):
+        self.predictor = predictor
+        self.explainer = explainer if explainer is not None else load_explainer(predictor)
+        self.groups = feature_groups(predictor.named_steps['preprocessor'])
+        self.top_k = min(top_k, len(FEATURES))
+        self.exact = exact
+
+    @property
+    def base_value(self):
+        return float(np.ravel(self.explainer.expected_value)[0])
+
+    def contributions(self, X):
+        """(n_rows, n_features) SHAP values, summed over each feature's one-hot columns."""
+        out = np.empty((len(X), len(FEATURES)))
+        buffer = np.empty((min(len(X), DENSE_CHUNK_ROWS), len(self.groups)))
+        for start in range(0, len(X), DENSE_CHUNK_ROWS):
+            rows = transform_features(self.predictor, X.iloc[start:start + DENSE_CHUNK_ROWS], out=buffer)
+            values = self.explainer.shap_values(rows, approximate=not self.exact, check_additivity=False)
+            out[start:start + rows.shape[0]] = np.asarray(values) @ self.groups
+        return out
+
+    def top_columns(self, X):
+        """Compact table of the `top_k` largest contributions per row, by absolute size."""
+        values = self.contributions(X)
+        order = np.argsort(-np.abs(values), axis=1, kind='stable')[:, :self.top_k]
+        names = np.array(FEATURES, dtype=object)
+        columns = {}
+        for i in range(self.top_k):
+            columns[f'Driver {i + 1}'] = names[order[:, i]]
+            columns[f'Impact {i + 1} (in Lakhs)'] = np.round(np.take_along_axis(values, order[:, i:i + 1], axis=1)[:, 0], 3)
+        return columns
@@ -0,0 +1,39 @@
+from carvault.lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+# Standard names we want (the raw CSV ships an unnamed index and 'Price(in Lakhs)')
+STD_COLUMNS = ['index', 'KM Driven', 'Fuel Type', 'Transmission Type', 'Ownership',
+               'Selling Price (in Lakhs)', 'Brand', 'Model_Only', 'Car Age']
+
+# Numeric and categorical features (names must match the fitted ColumnTransformer)
+NUMERIC_FEATURES = ['KM Driven', 'Ownership', 'Car Age']
+CATEGORICAL_FEATURES = ['Fuel Type', 'Transmission Type', 'Brand', 'Model_Only']
+FEATURES = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+TARGET = 'Selling Price (in Lakhs)'
+
+
+def normalize_columns(df):
+    # Force rename all columns based on order, otherwise just clean whatever we have
+    if len(df.columns) == len(STD_COLUMNS):
+        df.columns = STD_COLUMNS
+    else:
+        print(f"Warning: Expected {len(STD_COLUMNS)} columns, found {len(df.columns)}")
+        df.columns = df.columns.str.replace('\r', '', regex=False).str.replace('\n', '', regex=False).str.strip()
+    return df
+
+
+def missing_features(columns):
+    columns = set(columns)
+    return [c for c in FEATURES if c not in columns]
+
+
+def prepare_features(df):
+    """Return the model feature frame plus a mask of rows that can be scored."""
+    X = df[FEATURES].copy()
+    for col in NUMERIC_FEATURES:
+        X[col] = pd.to_numeric(X[col], errors='coerce')
+    for col in CATEGORICAL_FEATURES:
+        X[col] = X[col].astype('string').str.strip()
+    valid = X.notna().all(axis=1).to_numpy()
+    return X, valid
@@ -0,0 +1,240 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+FOREST_PATH = 'src/car_price_forest.npz'
+DENSE_CHUNK_ROWS = 16_384
+COMPACT_EVERY = 4
+# Up to this many rows the compiled walk wins; past it the per-call dispatch
+# overhead is amortised and sklearn's Cython traversal is faster than NumPy gathers
+COMPILED_MAX_ROWS = 128
+
+
+class CompiledForest:
+    """A fitted RandomForestRegressor flattened into contiguous node arrays.
+
+    Every tree's nodes live in one set of arrays (offset by tree), and leaves
+    point back at themselves, so a whole batch of rows walks all trees at once
+    with one gather per depth level instead of dispatching to 100 separate
+    estimator objects.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.is_leaf = left == np.arange(len(left), dtype=left.dtype)
+        # Interleaved (left, right) pairs so a step is a single gather
+        self.children = np.stack([left, right], axis=1).ravel()
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def node_count(self):
+        return len(self.feature)
+
+    @classmethod
+    def from_estimator(cls, forest):
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            ids = np.arange(tree.node_count, dtype=np.int32) + offset
+            is_leaf = tree.children_left == -1
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, ids, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, ids, tree.children_right + offset).astype(np.int32))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+        return cls(
+            np.concatenate(features), np.concatenate(thresholds),
+            np.concatenate(lefts), np.concatenate(rights), np.concatenate(values),
+            np.asarray(roots, dtype=np.int32), max_depth, forest.n_features_in_,
+        )
+
+    def _arrays(self):
+        return {
+            'feature': self.feature, 'threshold': self.threshold, 'left': self.left, 'right': self.right,
+            'value': self.value, 'roots': self.roots,
+            'max_depth': np.asarray(self.max_depth), 'n_features': np.asarray(self.n_features),
+        }
+
+    def save(self, path=FOREST_PATH):
+        """Write an .npz archive, or a directory of .npy files that `load` can memory-map."""
+        if path.endswith('.npz'):
+            np.savez(path, **self._arrays())
+            return
+        os.makedirs(path, exist_ok=True)
+        for key, array in self._arrays().items():
+            np.save(os.path.join(path, f"{key}.npy"), array)
+
+    @classmethod
+    def load(cls, path=FOREST_PATH, mmap_mode=None):
+        if os.path.isdir(path):
+            keys = ['feature', 'threshold', 'left', 'right', 'value', 'roots', 'max_depth', 'n_features']
+            return cls(**{key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode=mmap_mode) for key in keys})
+        with np.load(path) as data:
+            return cls(**{key: data[key] for key in data.files})
+
+    def matches(self, forest):
+        return (
+            self.n_trees == len(forest.estimators_)
+            and self.n_features == forest.n_features_in_
+            and self.node_count == sum(e.tree_.node_count for e in forest.estimators_)
+        )
+
+    def leaf_values(self, X):
+        """Per-tree predictions, shape (n_rows, n_trees). X must be NaN-free."""
+        # sklearn compares float32 inputs against float64 thresholds; mirror that exactly
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_cols = X.shape
+        flat = X.ravel()
+        # One (tree, row) walker per position, tree-major so each tree's nodes stay cache-local
+        leaves = np.repeat(self.roots, n_rows)
+        offsets = np.tile(np.arange(n_rows, dtype=np.int64) * n_cols, self.n_trees)
+        active = np.flatnonzero(~self.is_leaf[leaves])
+        nodes = leaves[active]
+        offsets = offsets[active]
+        # Walk one level per step; leaves loop onto themselves, so finished walkers
+        # are only dropped every few steps to amortise the compaction cost
+        step = 0
+        while active.size:
+            go_right = flat[offsets + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_right]
+            step += 1
+            if step % COMPACT_EVERY == 0 or step >= self.max_depth:
+                done = self.is_leaf[nodes]
+                leaves[active[done]] = nodes[done]
+                keep = ~done
+                active, nodes, offsets = active[keep], nodes[keep], offsets[keep]
+        return self.value[leaves].reshape(self.n_trees, n_rows).T
+
+    def predict(self, X):
+        per_tree = self.leaf_values(X)
+        # Sum trees in order, as sklearn does, so results match bit for bit
+        total = np.zeros(per_tree.shape[0])
+        for t in range(self.n_trees):
+            total += per_tree[:, t]
+        return total / self.n_trees
+
+
+class CompiledEncoder:
+    """The fitted StandardScaler + OneHotEncoder/OrdinalEncoder ColumnTransformer as plain arrays.
+
+    Produces the same dense matrix as `preprocessor.transform(X).toarray()`
+    without sklearn's per-call validation, which dominates single-row latency.
+    """
+
+    def __init__(self, numeric, mean, scale, categorical, categories, ordinal=False):
+        self.numeric = list(numeric)
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+        self.categorical = list(categorical)
+        self.categories = [pd.Index(c) for c in categories]
+        self.ordinal = ordinal
+        self.offsets = np.cumsum([len(self.numeric)] + [1 if ordinal else len(c) for c in self.categories])
+
+    @property
+    def width(self):
+        return int(self.offsets[-1])
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor):
+        # Imported here so loading this module never pulls in sklearn by itself
+        from sklearn.preprocessing import OrdinalEncoder
+        scaler = preprocessor.named_transformers_.get('num')
+        encoder = preprocessor.named_transformers_.get('cat')
+        names = [name for name, _, _ in preprocessor.transformers_ if name != 'remainder']
+        if names != ['num', 'cat'] or not hasattr(scaler, 'scale_') or not hasattr(encoder, 'categories_'):
+            return None
+        if getattr(encoder, 'drop_idx_', None) is not None or getattr(encoder, 'infrequent_categories_', None) is not None:
+            return None
+        ordinal = isinstance(encoder, OrdinalEncoder)
+        if ordinal and encoder.handle_unknown == 'use_encoded_value' and encoder.unknown_value != -1:
+            return None
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(len(scaler.scale_))
+        scale = scaler.scale_ if scaler.with_std else np.ones(len(scaler.mean_))
+        return cls(scaler.feature_names_in_, mean, scale, encoder.feature_names_in_, encoder.categories_, ordinal)
+
+    def transform(self, X, dtype=np.float32, out=None):
+        """Encode X, writing into the first len(X) rows of `out` when a preallocated buffer is given."""
+        out = np.empty((len(X), self.width), dtype=dtype) if out is None else out[:len(X)]
+        n_numeric = len(self.numeric)
+        out[:, :n_numeric] = (X[self.numeric].to_numpy(dtype=float) - self.mean) / self.scale
+        codes = [c.get_indexer(X[col].to_numpy(dtype=object)) for col, c in zip(self.categorical, self.categories)]
+        if self.ordinal:
+            # Unknown categories encode as -1, like OrdinalEncoder(unknown_value=-1)
+            out[:, n_numeric:] = np.column_stack(codes) if codes else 0
+            return out
+        out[:, n_numeric:] = 0
+        rows = np.arange(len(X))
+        for col_codes, offset in zip(codes, self.offsets):
+            known = col_codes >= 0  # unknown categories encode as all zeros, like handle_unknown='ignore'
+            out[rows[known], offset + col_codes[known]] = 1
+        return out
+
+
+class CompiledPipeline:
+    """Drop-in replacement for `pipeline.predict` backed by a CompiledForest."""
+
+    def __init__(self, pipeline, forest):
+        self.pipeline = pipeline
+        self.preprocessor = pipeline.named_steps['preprocessor']
+        self.regressor = pipeline.named_steps.get('regressor')  # None for forest_only()
+        self.encoder = CompiledEncoder.from_preprocessor(self.preprocessor)
+        self.forest = forest
+
+    @classmethod
+    def forest_only(cls, preprocessor, forest):
+        """Score every batch size with the node arrays, never touching the sklearn estimators.
+
+        Slower than sklearn past COMPILED_MAX_ROWS, but `forest` can be memory-mapped while an
+        unpickled RandomForestRegressor always lives on the process's own heap.
+        """
+        from sklearn.pipeline import Pipeline
+        return cls(Pipeline([('preprocessor', preprocessor)]), forest)
+
+    def leaf_values(self, X):
+        """Per-tree predictions for any number of rows, DENSE_CHUNK_ROWS at a time."""
+        return np.concatenate([self.forest.leaf_values(self.transform(X.iloc[start:start + DENSE_CHUNK_ROWS]))
+                               for start in range(0, len(X), DENSE_CHUNK_ROWS)])
+
+    @property
+    def named_steps(self):
+        return self.pipeline.named_steps
+
+    def transform(self, X, dtype=np.float32, out=None):
+        if self.encoder is not None:
+            return self.encoder.transform(X, dtype, out)
+        transformed = self.preprocessor.transform(X)
+        if hasattr(transformed, 'toarray'):
+            transformed = transformed.toarray()
+        return transformed.astype(dtype, copy=False)
+
+    def predict(self, X):
+        out = np.empty(len(X))
+        # Narrow ordinal matrices are encoded into one buffer reused by every chunk; wide one-hot
+        # rows stay sparse, which sklearn's trees traverse faster than the dense equivalent
+        buffer = None
+        if self.encoder is not None and self.encoder.ordinal and len(X) > COMPILED_MAX_ROWS:
+            buffer = np.empty((min(len(X), DENSE_CHUNK_ROWS), self.encoder.width), dtype=np.float32)
+        for start in range(0, len(X), DENSE_CHUNK_ROWS):
+            chunk = X.iloc[start:start + DENSE_CHUNK_ROWS]
+            if len(chunk) <= COMPILED_MAX_ROWS or self.regressor is None:
+                out[start:start + len(chunk)] = self.forest.predict(self.transform(chunk))
+            elif buffer is not None:
+                out[start:start + len(chunk)] = self.regressor.predict(self.transform(chunk, out=buffer))
+            else:
+                out[start:start + len(chunk)] = self.pipeline.predict(chunk)
+        return out
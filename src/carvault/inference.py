@@ -0,0 +1,133 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from carvault.features import FEATURES, missing_features, prepare_features
+from carvault.forest import COMPILED_MAX_ROWS, FOREST_PATH, CompiledForest, CompiledPipeline
+
+MODEL_PATH = 'src/car_price_predictor.pkl'
+INTERVAL_LEVEL = 0.8  # central share of tree predictions reported as the price range
+
+
+def load_pipeline(model_path=MODEL_PATH):
+    with open(model_path, 'rb') as file:
+        return pickle.load(file)
+
+
+def load_predictor(pipeline, forest_path=FOREST_PATH, mmap_mode=None):
+    """Wrap the pipeline with the compiled forest when an up-to-date export exists."""
+    model = pipeline.named_steps['regressor']
+    if not hasattr(model, 'estimators_') or not os.path.exists(forest_path):
+        return pipeline
+    forest = CompiledForest.load(forest_path, mmap_mode=mmap_mode)
+    return CompiledPipeline(pipeline, forest) if forest.matches(model) else pipeline
+
+
+def load_explainer(pipeline):
+    import shap
+    return shap.TreeExplainer(pipeline.named_steps['regressor'])
+
+
+def feature_names(preprocessor):
+    try:
+        return list(preprocessor.get_feature_names_out())
+    except Exception:
+        num_features = list(preprocessor.named_transformers_['num'].feature_names_in_)
+        ohe_transformer = preprocessor.named_transformers_['cat']
+        cat_features_original = list(ohe_transformer.feature_names_in_)
+        cat_features_generated = []
+        for i, categories in enumerate(ohe_transformer.categories_):
+            original_feature_name = cat_features_original[i]
+            for category in categories:
+                cat_features_generated.append(f"{original_feature_name}_{category}")
+        return num_features + cat_features_generated
+
+
+def transform_dense(preprocessor, X):
+    transformed = preprocessor.transform(X)
+    if hasattr(transformed, "toarray"):
+        transformed = transformed.toarray()
+    # toarray() already yields float64 for the default encoders; don't copy it a second time
+    return transformed.astype(float, copy=False)
+
+
+def keeps_sparse(predictor):
+    """True when the regressor must see the preprocessor's CSR output as-is.
+
+    XGBoost reads entries absent from a sparse matrix as missing, not as 0.0, so a one-hot
+    model fitted on CSR rows scores the densified rows differently.
+    """
+    return hasattr(predictor.named_steps['regressor'], 'get_booster')
+
+
+def dense_rows(transformed):
+    return transformed.toarray() if hasattr(transformed, 'toarray') else transformed
+
+
+def transform_features(predictor, X, out=None):
+    """Feature matrix as the regressor saw it in training: dense float64, or CSR for XGBoost.
+
+    `out` is an optional preallocated buffer for the compiled encoder.
+    """
+    # The compiled encoder skips sklearn's per-call validation when available
+    if isinstance(predictor, CompiledPipeline):
+        return predictor.transform(X, dtype=float, out=out)
+    if keeps_sparse(predictor):
+        return predictor.named_steps['preprocessor'].transform(X)
+    return transform_dense(predictor.named_steps['preprocessor'], X)
+
+
+def predict_transformed(predictor, transformed):
+    """Score rows that were already run through the preprocessor."""
+    if isinstance(predictor, CompiledPipeline):
+        return predictor.forest.predict(transformed)
+    return predictor.named_steps['regressor'].predict(transformed)
+
+
+def tree_predictions(predictor, X):
+    """Per-tree predictions, shape (n_rows, n_trees), or None when the model is not a random forest.
+
+    Small batches (and forest-only predictors) walk the compiled node arrays; larger ones get
+    every tree's leaf id from one `apply` call and look the leaf values up in a single gather.
+    """
+    compiled = isinstance(predictor, CompiledPipeline)
+    if compiled and predictor.regressor is None:
+        return predictor.leaf_values(X)
+    model = predictor.named_steps['regressor']
+    if not hasattr(model, 'estimators_'):
+        return None
+    if compiled and len(X) <= COMPILED_MAX_ROWS:
+        return predictor.forest.leaf_values(predictor.transform(X))
+    leaves = model.apply(predictor.transform(X) if compiled else predictor.named_steps['preprocessor'].transform(X))
+    if compiled:
+        return predictor.forest.value[predictor.forest.roots + leaves]
+    return np.column_stack([est.tree_.value[leaves[:, t], 0, 0] for t, est in enumerate(model.estimators_)])
+
+
+def predict_with_interval(predictor, X, level=INTERVAL_LEVEL):
+    """(prices, lower, upper) from a single pass over the trees; bounds are None for non-forest models."""
+    per_tree = tree_predictions(predictor, X)
+    if per_tree is None:
+        return predictor.predict(X), None, None
+    # Sum trees in order, as sklearn does, so prices match `predict` bit for bit
+    total = np.zeros(per_tree.shape[0])
+    for t in range(per_tree.shape[1]):
+        total += per_tree[:, t]
+    tail = (1 - level) / 2
+    lower, upper = np.quantile(per_tree, [tail, 1 - tail], axis=1)
+    return total / per_tree.shape[1], lower, upper
+
+
+def records_frame(records):
+    """Build a model-ready frame from a list of feature dicts, rejecting unusable rows."""
+    df = pd.DataFrame.from_records(records)
+    missing = missing_features(df.columns)
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    X, valid = prepare_features(df)
+    if not valid.all():
+        bad = np.flatnonzero(~valid).tolist()
+        raise ValueError(f"Invalid or empty feature values in records: {bad}")
+    return X[FEATURES].astype(object)
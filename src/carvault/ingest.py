@@ -0,0 +1,135 @@
+# Incremental ingestion of new listings.
+#
+# Each run validates a batch, drops rows already seen (by a 64-bit hash of the
+# normalized row, stored per partition), writes the survivors as a new Arrow
+# partition, commits it by rewriting the manifest, and folds the batch into the
+# EDA summary. The history is never re-read: only the stored hashes are.
+import json
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from carvault.dataset import (
+    COLUMNS, DATA_PATH, MANIFEST_FILE, PARTITIONS_DIR, SCHEMA, dataset_fingerprint, list_partitions, read_table,
+)
+from carvault.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES, TARGET, normalize_columns
+from carvault.summary import SUMMARY_PATH, merge_batch, read_summary, save_summary
+
+BASE_HASHES = 'base.hashes.npy'
+
+
+@dataclass
+class IngestReport:
+    partition: str
+    received: int
+    invalid: int
+    duplicates: int
+    added: int
+    seconds: float
+
+
+def validate(df):
+    """Coerce a raw batch to the dataset schema; returns (clean frame, number of rejected rows)."""
+    df = normalize_columns(df).drop(columns=['index'], errors='ignore')
+    missing = [c for c in COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    df = df[COLUMNS].copy()
+    for col in NUMERIC_FEATURES + [TARGET]:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in CATEGORICAL_FEATURES:
+        df[col] = df[col].astype('string').str.strip().replace('', pd.NA)
+    valid = df.notna().all(axis=1)
+    valid &= (df[NUMERIC_FEATURES] >= 0).all(axis=1) & (df[TARGET] > 0)
+    valid &= (df['Ownership'] % 1 == 0) & (df['Car Age'] % 1 == 0)
+    clean = df[valid.to_numpy()].reset_index(drop=True)
+    for col, typ in zip(SCHEMA.names, SCHEMA.types):
+        if col in NUMERIC_FEATURES:
+            clean[col] = clean[col].astype(typ.to_pandas_dtype())
+    return clean, int((~valid).sum())
+
+
+def row_hashes(df):
+    """64-bit hash of each row's values, independent of the column dtypes they arrived with."""
+    normalized = pd.DataFrame({
+        col: df[col].astype(str) if col in CATEGORICAL_FEATURES else df[col].astype(np.float64)
+        for col in COLUMNS
+    })
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+def _hash_path(partitions_dir, name):
+    return os.path.join(partitions_dir, f"{name}.hashes.npy")
+
+
+def known_hashes(data_path=DATA_PATH, partitions_dir=PARTITIONS_DIR):
+    """Sorted hashes of every committed row; the base artifact's are computed once and stored."""
+    base = os.path.join(partitions_dir, BASE_HASHES)
+    if not os.path.exists(base):
+        os.makedirs(partitions_dir, exist_ok=True)
+        np.save(base, np.sort(row_hashes(read_table(data_path, partitions_dir=None).to_pandas())))
+    parts = [np.load(base)]
+    parts += [np.load(_hash_path(partitions_dir, p['name'])) for p in list_partitions(partitions_dir)]
+    return np.unique(np.concatenate(parts))
+
+
+def _commit_manifest(partitions_dir, partitions):
+    path = os.path.join(partitions_dir, MANIFEST_FILE)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'partitions': partitions}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def ingest(source, data_path=DATA_PATH, partitions_dir=PARTITIONS_DIR, summary_path=SUMMARY_PATH):
+    """Append a CSV/Parquet file (or DataFrame) of new listings as a validated, deduplicated partition."""
+    start = time.perf_counter()
+    if isinstance(source, pd.DataFrame):
+        raw = source.copy()
+    elif str(source).endswith('.parquet'):
+        raw = pd.read_parquet(source)
+    else:
+        raw = pd.read_csv(source)
+    clean, invalid = validate(raw)
+
+    # Dedupe within the batch and against everything already committed
+    hashes = row_hashes(clean)
+    _, first = np.unique(hashes, return_index=True)
+    fresh = np.zeros(len(clean), dtype=bool)
+    fresh[first] = True
+    fresh &= ~np.isin(hashes, known_hashes(data_path, partitions_dir))
+    batch, hashes = clean[fresh].reset_index(drop=True), hashes[fresh]
+
+    name = time.strftime('part-%Y%m%d-%H%M%S')
+    existing = list_partitions(partitions_dir)
+    suffix = 1
+    while any(p['name'] == name for p in existing):
+        name, suffix = f"{time.strftime('part-%Y%m%d-%H%M%S')}-{suffix}", suffix + 1
+    report = IngestReport(name, len(raw), invalid, len(clean) - len(batch), len(batch), 0.0)
+    if not len(batch):
+        report.seconds = round(time.perf_counter() - start, 3)
+        return report
+
+    # Partition and its hashes first, then the manifest (the commit point)
+    fingerprint_before = dataset_fingerprint(data_path, partitions_dir)
+    table = pa.Table.from_pandas(batch, preserve_index=False).cast(SCHEMA)
+    feather.write_feather(table, os.path.join(partitions_dir, f"{name}.feather"), compression='uncompressed')
+    np.save(_hash_path(partitions_dir, name), np.sort(hashes))
+    _commit_manifest(partitions_dir, existing + [{
+        'name': name, 'rows': len(batch), 'ingested_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }])
+
+    # Fold the batch into the EDA summary; a missing or stale summary is left for load_summary to rebuild
+    summary = read_summary(summary_path)
+    if summary is not None and summary.get('fingerprint') == fingerprint_before:
+        merge_batch(summary, table.to_pandas())
+        summary['fingerprint'] = dataset_fingerprint(data_path, partitions_dir)
+        save_summary(summary, summary_path)
+
+    report.seconds = round(time.perf_counter() - start, 3)
+    return report
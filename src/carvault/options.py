@@ -0,0 +1,62 @@
+import json
+import os
+
+import numpy as np
+
+OPTIONS_PATH = 'src/car_options.json'
+OPTION_COLUMNS = ['Fuel Type', 'Transmission Type', 'Ownership']
+
+
+def _sorted_unique(series):
+    return sorted(series.dropna().unique().tolist())
+
+
+def build_option_index(df):
+    """Precompute every dropdown list once: brands, brand -> models, and the other categoricals."""
+    pairs = df[['Brand', 'Model_Only']].dropna().drop_duplicates()
+    models_by_brand = {
+        str(brand): sorted(group.astype(str).unique().tolist())
+        for brand, group in pairs.groupby('Brand', sort=True)['Model_Only']
+    }
+    index = {'Brand': sorted(models_by_brand), 'models_by_brand': models_by_brand}
+    for col in OPTION_COLUMNS:
+        index[col] = [v.item() if isinstance(v, np.generic) else v for v in _sorted_unique(df[col])]
+    return index
+
+
+def save_option_index(index, path=OPTIONS_PATH):
+    with open(path, 'w') as f:
+        json.dump(index, f, indent=1)
+
+
+def load_option_index(path=OPTIONS_PATH, df=None):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    if df is None:
+        raise FileNotFoundError(path)
+    return build_option_index(df)
+
+
+def known_mask(X, index):
+    """Vectorized check of feature rows against the index; True where every value was seen in training."""
+    known = X['Brand'].isin(index['Brand']).to_numpy()
+    pairs = {f"{brand}\x1f{model}" for brand, models in index['models_by_brand'].items() for model in models}
+    keys = X['Brand'].astype(str) + '\x1f' + X['Model_Only'].astype(str)
+    known = known & keys.isin(pairs).to_numpy()
+    for col in OPTION_COLUMNS:
+        known = known & X[col].isin(index[col]).to_numpy()
+    return known
+
+
+def describe_unknown(record, index):
+    """Human readable reasons a single record falls outside the index."""
+    problems = []
+    if record['Brand'] not in index['models_by_brand']:
+        problems.append(f"unknown Brand '{record['Brand']}'")
+    elif record['Model_Only'] not in index['models_by_brand'][record['Brand']]:
+        problems.append(f"unknown Model_Only '{record['Model_Only']}' for Brand '{record['Brand']}'")
+    for col in OPTION_COLUMNS:
+        if record[col] not in index[col]:
+            problems.append(f"unknown {col} '{record[col]}'")
+    return problems
@@ -0,0 +1,256 @@
+# Local model registry: one directory per trained version plus a CURRENT pointer.
+#
+#   src/models/
+#     CURRENT                      -> "20261018-101500"
+#     20261018-101500/
+#       pipeline.joblib            the fitted pipeline (sklearn unpickles its trees onto each process's heap)
+#       forest/*.npy               compiled node arrays (RandomForest only), memory-mapped
+#       options.json               category vocabularies / dropdown index
+#       comparables.joblib         per-model KD-trees over the training listings
+#       warm_cache.npz             pre-computed explanations (written later by warm_cache.py, not hashed)
+#       explainer.joblib           TreeExplainer for memory-mapping (written by the first process to need it, not hashed)
+#       metrics.json               training/holdout metrics report
+#       metadata.json              feature schema, metrics, vocabularies, sha256 and size/mtime per file
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+
+import joblib
+
+from carvault.comparables import ComparablesIndex
+from carvault.features import CATEGORICAL_FEATURES, FEATURES, NUMERIC_FEATURES, TARGET
+from carvault.forest import FOREST_PATH, CompiledForest
+from carvault.inference import MODEL_PATH, load_pipeline, load_predictor
+from carvault.options import OPTIONS_PATH, load_option_index, save_option_index
+from carvault.warmup import load_warm_cache
+
+REGISTRY_DIR = 'src/models'
+CURRENT_FILE = 'CURRENT'
+PIPELINE_FILE = 'pipeline.joblib'
+FOREST_DIR = 'forest'
+OPTIONS_FILE = 'options.json'
+COMPARABLES_FILE = 'comparables.joblib'
+WARM_CACHE_FILE = 'warm_cache.npz'
+EXPLAINER_FILE = 'explainer.joblib'
+DERIVED_FILES = (WARM_CACHE_FILE, EXPLAINER_FILE)
+METRICS_FILE = 'metrics.json'
+METADATA_FILE = 'metadata.json'
+LEGACY_VERSION = 'legacy'
+
+
+@dataclass
+class ModelArtifact:
+    version: str
+    path: str
+    metadata: dict = field(default_factory=dict)
+
+    def file(self, name):
+        return os.path.join(self.path, name)
+
+
+@dataclass
+class LoadedModel:
+    version: str
+    pipeline: object  # the fitted sklearn Pipeline
+    predictor: object  # CompiledPipeline when a compiled forest is available, else `pipeline`
+    options: dict = None
+    metadata: dict = field(default_factory=dict)
+    comparables: ComparablesIndex = None
+    warm_explanations: list = field(default_factory=list)  # [(cache key, Explanation)]
+    path: str = None  # the version directory (None for the legacy pickle)
+
+    @property
+    def preprocessor(self):
+        return self.pipeline.named_steps['preprocessor']
+
+    @property
+    def explainer_path(self):
+        return os.path.join(self.path, EXPLAINER_FILE) if self.path else None
+
+    @property
+    def forest_path(self):
+        """The memory-mappable compiled forest, or None (legacy pickle, non-forest models)."""
+        path = os.path.join(self.path, FOREST_DIR) if self.path else None
+        return path if path and os.path.isdir(path) else None
+
+
+def sha256_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _artifact_files(root):
+    """(relative name, path) of every checksummed file in a version directory."""
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, root)
+            # Derived files are (re)built after registration
+            if rel != METADATA_FILE and rel not in DERIVED_FILES and not rel.endswith('.tmp'):
+                yield rel.replace(os.sep, '/'), path
+
+
+def _hash_tree(root):
+    return {rel: sha256_file(path) for rel, path in _artifact_files(root)}
+
+
+def _stat_tree(root):
+    """{name: [size, mtime_ns]}: a cheap stand-in for the checksums while files are untouched."""
+    stats = {}
+    for rel, path in _artifact_files(root):
+        st = os.stat(path)
+        stats[rel] = [st.st_size, st.st_mtime_ns]
+    return stats
+
+
+def _vocabularies(pipeline):
+    ohe = pipeline.named_steps['preprocessor'].named_transformers_['cat']
+    return {col: [str(c) for c in cats] for col, cats in zip(ohe.feature_names_in_, ohe.categories_)}
+
+
+def register(pipeline, metrics=None, options=None, registry_dir=REGISTRY_DIR, promote=True, lineage=None,
+             comparables=None):
+    """Store a fitted pipeline as a new immutable version and optionally make it current.
+
+    `lineage` records what the model was trained on (dataset partitions, parent version for refreshes).
+    """
+    import numpy as np
+    import sklearn
+
+    version = time.strftime('%Y%m%d-%H%M%S')
+    final_dir = os.path.join(registry_dir, version)
+    suffix = 1
+    while os.path.exists(final_dir):
+        final_dir = os.path.join(registry_dir, f"{version}-{suffix}")
+        suffix += 1
+    version = os.path.basename(final_dir)
+
+    # Build in a hidden directory and rename, so readers never see a half-written version
+    staging = os.path.join(registry_dir, f".{version}.tmp")
+    os.makedirs(staging)
+    try:
+        joblib.dump(pipeline, os.path.join(staging, PIPELINE_FILE))
+        model = pipeline.named_steps['regressor']
+        if hasattr(model, 'estimators_'):
+            CompiledForest.from_estimator(model).save(os.path.join(staging, FOREST_DIR))
+        if options is not None:
+            save_option_index(options, os.path.join(staging, OPTIONS_FILE))
+        if comparables is not None:
+            comparables.save(os.path.join(staging, COMPARABLES_FILE))
+        with open(os.path.join(staging, METRICS_FILE), 'w') as f:
+            json.dump(metrics or {}, f, indent=2, default=str)
+        metadata = {
+            'version': version,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'model_family': type(model).__name__,
+            'feature_schema': {'numeric': NUMERIC_FEATURES, 'categorical': CATEGORICAL_FEATURES,
+                               'features': FEATURES, 'target': TARGET},
+            'metrics': metrics or {},
+            'lineage': lineage or {},
+            'vocabularies': _vocabularies(pipeline),
+            'library_versions': {'scikit-learn': sklearn.__version__, 'numpy': np.__version__},
+            'sha256': _hash_tree(staging),
+            'stat': _stat_tree(staging),  # the rename below keeps sizes and mtimes
+        }
+        with open(os.path.join(staging, METADATA_FILE), 'w') as f:
+            json.dump(metadata, f, indent=2, default=str)
+        os.rename(staging, final_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if promote:
+        set_current(version, registry_dir)
+    return ModelArtifact(version, final_dir, metadata)
+
+
+def set_current(version, registry_dir=REGISTRY_DIR):
+    if not os.path.isdir(os.path.join(registry_dir, version)):
+        raise ValueError(f"Unknown model version: {version}")
+    # Atomic pointer swap: write a temp file, then rename over CURRENT
+    tmp = os.path.join(registry_dir, f".{CURRENT_FILE}.tmp")
+    with open(tmp, 'w') as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(registry_dir, CURRENT_FILE))
+
+
+def current_version(registry_dir=REGISTRY_DIR):
+    try:
+        with open(os.path.join(registry_dir, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def list_versions(registry_dir=REGISTRY_DIR):
+    if not os.path.isdir(registry_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(registry_dir)
+        if not name.startswith('.') and os.path.isfile(os.path.join(registry_dir, name, METADATA_FILE))
+    )
+
+
+def resolve(version=None, registry_dir=REGISTRY_DIR):
+    """ModelArtifact for `version` (default: CURRENT), or None when the registry is empty."""
+    version = version or current_version(registry_dir)
+    if version is None:
+        return None
+    path = os.path.join(registry_dir, version)
+    with open(os.path.join(path, METADATA_FILE)) as f:
+        return ModelArtifact(version, path, json.load(f))
+
+
+def verify(artifact):
+    expected = artifact.metadata.get('sha256', {})
+    actual = _hash_tree(artifact.path)
+    bad = sorted(name for name in set(expected) | set(actual) if expected.get(name) != actual.get(name))
+    if bad:
+        raise ValueError(f"Model {artifact.version} failed integrity check: {', '.join(bad)}")
+
+
+_verified = {}  # version directory -> _stat_tree() of the files that last passed verify() in this process
+
+
+def check_integrity(artifact):
+    """verify() the first time a version is loaded, then only when a file's size or mtime changed.
+
+    Files untouched since registration match the stats recorded next to their checksums and are
+    never re-hashed; versions copied in from elsewhere are hashed once per process.
+    """
+    stats = _stat_tree(artifact.path)
+    if stats == artifact.metadata.get('stat') or stats == _verified.get(artifact.path):
+        return
+    verify(artifact)
+    _verified[artifact.path] = stats
+
+
+def load_model(version=None, registry_dir=REGISTRY_DIR, check=True):
+    """Load a registered version (default: CURRENT), falling back to the legacy pickle."""
+    artifact = resolve(version, registry_dir) if version != LEGACY_VERSION else None
+    if artifact is None:
+        pipeline = load_pipeline(MODEL_PATH)
+        options = load_option_index(OPTIONS_PATH) if os.path.exists(OPTIONS_PATH) else None
+        return LoadedModel(LEGACY_VERSION, pipeline, load_predictor(pipeline, FOREST_PATH), options)
+
+    if check:
+        check_integrity(artifact)
+    # mmap_mode only maps the pipeline's plain numpy arrays; sklearn's Tree objects unpickle their
+    # node arrays onto the heap. The compiled forest and the comparables index are true mappings.
+    pipeline = joblib.load(artifact.file(PIPELINE_FILE), mmap_mode='r')
+    forest_dir = artifact.file(FOREST_DIR)
+    predictor = load_predictor(pipeline, forest_dir, mmap_mode='r') if os.path.isdir(forest_dir) else pipeline
+    options_path = artifact.file(OPTIONS_FILE)
+    options = load_option_index(options_path) if os.path.exists(options_path) else None
+    comparables_path = artifact.file(COMPARABLES_FILE)
+    comparables = ComparablesIndex.load(comparables_path, mmap_mode='r') if os.path.exists(comparables_path) else None
+    warm_path = artifact.file(WARM_CACHE_FILE)
+    warm = load_warm_cache(warm_path) if os.path.exists(warm_path) else []
+    return LoadedModel(artifact.version, pipeline, predictor, options, artifact.metadata, comparables, warm,
+                       artifact.path)
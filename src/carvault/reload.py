@@ -0,0 +1,134 @@
+# Hot model reload: a background thread watches the registry's CURRENT pointer (or the
+# legacy pickle's mtime/size), loads the new model and its TreeExplainer off the request
+# path, and swaps a single reference once both are ready. Readers grab `watcher.current`
+# once and use that snapshot, so they never block on a load or see a half-built model.
+import logging
+import os
+import threading
+
+from carvault.explain import ExplanationCache, explain_record, record_key
+from carvault.inference import MODEL_PATH
+from carvault.registry import CURRENT_FILE, LEGACY_VERSION, REGISTRY_DIR, current_version, load_model
+from carvault.shared import load_shared_explainer
+from carvault.telemetry import TELEMETRY, cache_samples, span
+
+RELOAD_INTERVAL = float(os.environ.get('CARVAULT_RELOAD_SECONDS', 10))
+
+logger = logging.getLogger(__name__)
+
+
+class ServingModel:
+    """One loaded model version with its explainer and explanation cache."""
+
+    def __init__(self, model):
+        self.model = model
+        self.explanations = ExplanationCache()  # per version, so a swap never serves stale prices
+        for key, explanation in model.warm_explanations:
+            self.explanations.put(key, explanation)
+        self._explainer = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self.model.version
+
+    @property
+    def explainer(self):
+        if self._explainer is None:
+            with self._lock:
+                if self._explainer is None:
+                    with span('explainer_load'):
+                        self._explainer = load_shared_explainer(self.model.pipeline, self.model.explainer_path)
+        return self._explainer
+
+    @property
+    def explainer_ready(self):
+        return self._explainer is not None
+
+    def explain(self, record):
+        """Price and SHAP vector for one car; the explainer is only loaded on a cache miss."""
+        key = record_key(record)
+        explanation = self.explanations.get(key)
+        if explanation is None:
+            explanation = explain_record(self.model.predictor, self.explainer, record)
+            self.explanations.put(key, explanation)
+        return explanation
+
+
+def artifact_signature(registry_dir=REGISTRY_DIR):
+    """Cheap fingerprint of what is deployed; changes whenever a new model is promoted or copied in."""
+    version = current_version(registry_dir)
+    if version is not None:
+        return version, os.stat(os.path.join(registry_dir, CURRENT_FILE)).st_mtime_ns
+    try:
+        stat = os.stat(MODEL_PATH)
+    except FileNotFoundError:
+        return None
+    return LEGACY_VERSION, stat.st_mtime_ns, stat.st_size
+
+
+class ModelWatcher:
+    """Serves `current` and swaps in newly promoted models from a background thread.
+
+    `warm_explainer` only concerns the startup model (build its explainer in the background
+    rather than on first use); a reloaded model is always swapped in with its explainer built.
+    """
+
+    def __init__(self, registry_dir=REGISTRY_DIR, interval=RELOAD_INTERVAL, warm_explainer=True):
+        self.registry_dir = registry_dir
+        self.interval = interval
+        self.warm_explainer = warm_explainer
+        self.reloads = 0
+        self.last_error = None
+        self._signature = artifact_signature(registry_dir)
+        # The first load is synchronous: there is nothing older to serve meanwhile
+        with span('model_load'):
+            self.current = ServingModel(load_model(self._version(), registry_dir))
+        TELEMETRY.add_collector('explanations', lambda: cache_samples(
+            'explanations', self.current.explanations.hits, self.current.explanations.misses))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _version(self):
+        return self._signature[0] if self._signature else LEGACY_VERSION
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='carvault-model-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        if self.warm_explainer:
+            self.current.explainer  # noqa: B018 - build the initial explainer off the request path
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """Reload if the deployed artifact changed; returns True when a new model was swapped in."""
+        try:
+            signature = artifact_signature(self.registry_dir)
+            if signature is None or signature == self._signature:
+                return False
+            with span('model_load'):
+                serving = ServingModel(load_model(signature[0], self.registry_dir))
+            serving.explainer  # noqa: B018 - ready to serve before it is visible to requests
+        except Exception as e:
+            # Keep serving the old model; retry on the next tick
+            self.last_error = repr(e)
+            TELEMETRY.inc('model_reload_failures_total')
+            logger.exception("Model reload failed")
+            return False
+        self._signature = signature
+        self.current = serving  # a single reference assignment is atomic
+        self.reloads += 1
+        self.last_error = None
+        TELEMETRY.inc('model_reloads_total')
+        logger.info("Swapped in model version %s", serving.version)
+        return True
@@ -0,0 +1,48 @@
+# What-if sweeps for one car: every variant of it the sensitivity panel plots, priced
+# together in a single vectorized predict.
+#
+#   mileage curves       Car Age 0-15 x KM_LEVELS (plus the car's own KM), as configured
+#   drivetrain curves    Car Age 0-15 for every Fuel Type x Transmission Type, at the car's own KM
+#
+# The grid never depends on the car's own age, so the panel can cache it per configuration
+# without Car Age; changing only the year reuses it.
+import numpy as np
+
+from carvault.features import FEATURES
+from carvault.lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+AGES = list(range(16))
+KM_LEVELS = [10_000, 30_000, 60_000, 100_000, 150_000]
+MILEAGE, DRIVETRAIN = 'mileage', 'drivetrain'
+PRICE_COLUMN = 'Price (in Lakhs)'
+
+
+def sensitivity_grid(record, options, ages=AGES, km_levels=KM_LEVELS):
+    """Model-ready frame of all variants, with 'Sweep' and 'Curve' labels for plotting."""
+    km = int(record['KM Driven'])
+    curves = [(MILEAGE, f"{level:,} km", level, record['Fuel Type'], record['Transmission Type'])
+              for level in sorted(set(km_levels) | {km})]
+    curves += [(DRIVETRAIN, f"{fuel} · {transmission}", km, fuel, transmission)
+               for fuel in options['Fuel Type'] for transmission in options['Transmission Type']]
+
+    n = len(ages)
+    sweep, label, km_driven, fuel, transmission = (np.repeat(np.array(values, dtype=object), n) for values in zip(*curves))
+    grid = pd.DataFrame({
+        'KM Driven': km_driven,
+        'Fuel Type': fuel,
+        'Transmission Type': transmission,
+        'Ownership': record['Ownership'],
+        'Brand': record['Brand'],
+        'Model_Only': record['Model_Only'],
+        'Car Age': np.tile(np.asarray(ages), len(curves)),
+    })
+    return grid[FEATURES].astype(object).assign(Sweep=sweep, Curve=label)
+
+
+def sweep(predictor, record, options, ages=AGES, km_levels=KM_LEVELS):
+    """The grid with a price per variant, from one predict call."""
+    grid = sensitivity_grid(record, options, ages, km_levels)
+    grid[PRICE_COLUMN] = predictor.predict(grid[FEATURES])
+    return grid
@@ -0,0 +1,58 @@
+# SHAP force plot rendering for the Prediction page.
+#
+# shap.getjs() inlines a ~350 KB bundle into every explanation's HTML. Instead
+# the bundle is served once by a static Streamlit component: the iframe keeps
+# its script across reruns and each explanation only ships the plot data.
+import json
+import os
+import shutil
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from carvault.telemetry import span
+
+COMPONENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'components', 'shap_force')
+BUNDLE_PATH = os.path.join(COMPONENT_DIR, 'bundle.js')
+
+_component = None
+
+
+def ensure_bundle():
+    """Copy shap's JS bundle next to the component page (done by build_assets.py or on first use)."""
+    if not os.path.exists(BUNDLE_PATH):
+        import shap
+        source = os.path.join(os.path.dirname(shap.__file__), 'plots', 'resources', 'bundle.js')
+        try:
+            shutil.copyfile(source, BUNDLE_PATH)
+        except OSError:
+            return False
+    return True
+
+
+def _force_component():
+    global _component
+    if _component is None and ensure_bundle():
+        _component = components.declare_component('shap_force', path=COMPONENT_DIR)
+    return _component
+
+
+def render_force_plot(explanation, feature_names, plot_cmap, key='shap_force'):
+    import shap
+    with span('force_plot'):
+        force_plot = shap.force_plot(
+            explanation.base_value,
+            explanation.shap_values,
+            explanation.row,
+            feature_names=feature_names,
+            matplotlib=False,
+            text_rotation=0,
+            plot_cmap=plot_cmap,
+        )
+    component = _force_component()
+    if component is not None:
+        component(data=json.dumps(dict(force_plot.data, labelMargin=20)), key=key, default=None)
+    else:
+        # Fall back to the self-contained HTML (bundle inlined) if the bundle can't be staged
+        shap_html = f"<div style='background: white; border-radius: 12px; padding: 20px; margin-top: 2rem;'>{shap.getjs()}{force_plot.html()}</div>"
+        st.components.v1.html(shap_html, height=200, scrolling=True)
@@ -0,0 +1,111 @@
+# Read-only data and model memory shared by every server process on a host.
+#
+# Each Streamlit/uvicorn replica used to hold private heap copies of the dataset and the
+# TreeExplainer's node arrays. Here both are views of files instead, so the kernel keeps one
+# physical copy in the page cache however many processes map them:
+#
+#   dataset     the uncompressed Arrow IPC artifact, wrapped as a DataFrame without copying
+#   explainer   the TreeExplainer pickled once per model version (explainer.joblib) and
+#               loaded with mmap_mode='r' by every process after the first
+#
+# The registry already maps the compiled forest, but every process still unpickles the
+# pipeline's sklearn trees onto its own heap; what this module saves comes from the dataset
+# and the explainer alone.
+import os
+import threading
+
+import joblib
+import pyarrow as pa
+
+from carvault.dataset import DATA_PATH, dataset_fingerprint, read_table
+from carvault.inference import load_explainer
+from carvault.lazy import lazy_import
+from carvault.telemetry import TELEMETRY
+
+pd = lazy_import('pandas')
+
+_datasets = {}
+_lock = threading.Lock()
+
+
+def frame_from_table(table):
+    """DataFrame over the table's buffers: numeric columns and category codes are not copied.
+
+    Zero-copy needs one chunk per column (the base artifact is written that way); tables
+    concatenated from partitions fall back to a regular to_pandas().
+    """
+    if any(column.num_chunks != 1 for column in table.columns):
+        return table.to_pandas()
+    columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        array = column.chunk(0)
+        if array.null_count:
+            return table.to_pandas()
+        if pa.types.is_dictionary(array.type):
+            dtype = pd.CategoricalDtype(array.dictionary.to_pylist())
+            columns[name] = pd.Categorical.from_codes(array.indices.to_numpy(zero_copy_only=True), dtype=dtype,
+                                                      validate=False)
+        else:
+            columns[name] = array.to_numpy(zero_copy_only=True)
+    return pd.DataFrame(columns, copy=False)
+
+
+def shared_dataset(path=DATA_PATH):
+    """The process-wide dataset frame, rebuilt (by whichever caller comes first) when the artifact changes.
+
+    Treat it as read-only; pandas copies on write, so modifying a derived frame never touches the mapping.
+    """
+    fingerprint = dataset_fingerprint(path)
+    entry = _datasets.get(path)
+    if entry is None or entry[0] != fingerprint:
+        with _lock:
+            entry = _datasets.get(path)
+            if entry is None or entry[0] != fingerprint:
+                entry = _datasets[path] = (fingerprint, frame_from_table(read_table(path)))
+    return entry[1]
+
+
+def load_shared_explainer(pipeline, path=None):
+    """TreeExplainer memory-mapped from `path`, writing it there first if no process has yet.
+
+    Without a path (legacy models) or a writable model directory, the explainer stays on this process's heap.
+    """
+    if path is None:
+        return load_explainer(pipeline)
+    if not os.path.exists(path):
+        explainer = load_explainer(pipeline)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            joblib.dump(explainer, tmp)
+            os.replace(tmp, path)  # concurrent writers produce identical files; the last rename wins
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return explainer
+    return joblib.load(path, mmap_mode='r')
+
+
+# --- Per-process memory ---
+def process_memory(pid='self'):
+    """{'rss', 'pss', 'uss', 'anonymous'} in bytes. PSS splits shared pages between the processes mapping
+    them and USS counts only this process's private pages, so they show what sharing saves."""
+    fields = {'Rss': 'rss', 'Pss': 'pss', 'Private_Clean': 'uss', 'Private_Dirty': 'uss', 'Anonymous': 'anonymous'}
+    usage = dict.fromkeys(fields.values(), 0)
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key = line.split(':', 1)[0]
+                if key in fields:
+                    usage[fields[key]] += int(line.split()[1]) * 1024
+    except OSError:
+        import resource
+        usage['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, where /proc is missing
+    return usage
+
+
+def memory_samples():
+    labels = {'pid': os.getpid()}
+    return [(f"process_{kind}_memory_bytes", labels, value) for kind, value in process_memory().items()]
+
+
+TELEMETRY.add_collector('process_memory', memory_samples)
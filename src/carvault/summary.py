@@ -0,0 +1,313 @@
+# Precomputed EDA aggregates, written at ingest time next to the dataset artifact.
+#
+# The summary stores *mergeable* state rather than finished charts, so appending a
+# partition of new listings updates it without re-reading the history:
+#   - numeric columns: fixed-width fine histograms keyed by absolute bin index
+#     (origin/width chosen at first build, so new bins can appear on either side),
+#     plus count/mean/M2 moments
+#   - numeric pairs: co-moments (for the correlation matrix) and 2-D density grids
+#   - categorical columns: full value counts, category x category crosstabs and
+#     per-category fine histograms of every numeric column (for box plots)
+# Everything the landing page and EDA dashboard display is derived from it.
+import json
+import os
+
+import numpy as np
+
+from carvault import charts
+from carvault.dataset import DATA_PATH, dataset_fingerprint, load_dataset
+from carvault.lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+SUMMARY_PATH = 'src/cars24_summary.json'
+SUMMARY_VERSION = 2
+PAIR_SEP = '\x1f'
+FINE_BINS = 240  # resolution of the stored histograms; displayed bins are groups of these
+HIST_GROUP = FINE_BINS // charts.HIST_BINS
+GRID_GROUP = FINE_BINS // charts.DENSITY_BINS
+
+
+def _pair(x, y):
+    return f"{x}{PAIR_SEP}{y}"
+
+
+def _add(store, keys, counts):
+    for key, count in zip(keys, counts):
+        key = str(key)
+        store[key] = store.get(key, 0) + int(count)
+
+
+def _bins(values, axis):
+    return np.floor((values - axis['origin']) / axis['width']).astype(np.int64)
+
+
+def _axis(values):
+    lo, hi = (float(values.min()), float(values.max())) if len(values) else (0.0, 1.0)
+    return {'origin': lo, 'width': (hi - lo) / FINE_BINS if hi > lo else 1.0 / FINE_BINS}
+
+
+def empty_summary(df):
+    numeric = {str(col): charts.is_numeric(df[col]) for col in df.columns}
+    return {
+        'version': SUMMARY_VERSION,
+        'fingerprint': None,
+        'rows': 0,
+        'columns': list(numeric),
+        'numeric': numeric,
+        'axes': {},
+        'moments': {},
+        'hist': {},
+        'counts': {},
+        'models': {},
+        'comoments': {},
+        'grids': {},
+        'by_category': {},
+        'crosstab': {},
+    }
+
+
+def merge_batch(summary, df):
+    """Fold a batch of validated rows into the summary in place (Chan et al. parallel moments)."""
+    if not len(df):
+        return summary
+    cols = summary['columns']
+    num_cols = [c for c in cols if summary['numeric'][c]]
+    cat_cols = [c for c in cols if not summary['numeric'][c]]
+    values = {c: df[c].to_numpy(dtype=np.float64) for c in num_cols}
+    labels = {c: df[c].astype(str) for c in cat_cols}
+    bins = {}
+
+    n_a, n_b = summary['rows'], len(df)
+    n = n_a + n_b
+    means_b = {c: float(values[c].mean()) for c in num_cols}
+    deltas = {}
+    for c in num_cols:
+        axis = summary['axes'].setdefault(c, _axis(values[c]))
+        bins[c] = _bins(values[c], axis)
+        keys, counts = np.unique(bins[c], return_counts=True)
+        _add(summary['hist'].setdefault(c, {}), keys.tolist(), counts)
+
+        m = summary['moments'].setdefault(c, {'mean': 0.0, 'm2': 0.0, 'min': np.inf, 'max': -np.inf})
+        deltas[c] = means_b[c] - m['mean']
+    for i, x in enumerate(num_cols):
+        for y in num_cols[i + 1:]:
+            key = _pair(x, y)
+            c_b = float(((values[x] - means_b[x]) * (values[y] - means_b[y])).sum())
+            summary['comoments'][key] = (summary['comoments'].get(key, 0.0) + c_b
+                                         + deltas[x] * deltas[y] * n_a * n_b / n)
+            cells = np.stack([bins[x] // GRID_GROUP, bins[y] // GRID_GROUP], axis=1)
+            keys, counts = np.unique(cells, axis=0, return_counts=True)
+            _add(summary['grids'].setdefault(key, {}), [f"{i},{j}" for i, j in keys.tolist()], counts)
+    for c in num_cols:
+        m = summary['moments'][c]
+        m2_b = float(((values[c] - means_b[c]) ** 2).sum())
+        m['m2'] += m2_b + deltas[c] ** 2 * n_a * n_b / n
+        m['mean'] += deltas[c] * n_b / n
+        m['min'] = min(m['min'], float(values[c].min()))
+        m['max'] = max(m['max'], float(values[c].max()))
+
+    for i, c in enumerate(cat_cols):
+        counts = labels[c].value_counts()
+        _add(summary['counts'].setdefault(c, {}), counts.index, counts.to_numpy())
+        for y in cat_cols[i + 1:]:
+            counts = (labels[c] + PAIR_SEP + labels[y]).value_counts()
+            _add(summary['crosstab'].setdefault(_pair(c, y), {}), counts.index, counts.to_numpy())
+        for v in num_cols:
+            frame = pd.DataFrame({'category': labels[c].to_numpy(), 'bin': bins[v], 'value': values[v]})
+            store = summary['by_category'].setdefault(_pair(c, v), {})
+            for category, group in frame.groupby('category', sort=False):
+                entry = store.setdefault(category, {'hist': {}, 'min': np.inf, 'max': -np.inf})
+                keys, counts = np.unique(group['bin'].to_numpy(), return_counts=True)
+                _add(entry['hist'], keys.tolist(), counts)
+                entry['min'] = min(entry['min'], float(group['value'].min()))
+                entry['max'] = max(entry['max'], float(group['value'].max()))
+    if 'Brand' in labels and 'Model_Only' in labels:
+        counts = (labels['Brand'] + PAIR_SEP + labels['Model_Only']).value_counts()
+        _add(summary['models'], counts.index, counts.to_numpy())
+
+    summary['rows'] = n
+    return summary
+
+
+def build_summary(df, fingerprint=None):
+    summary = merge_batch(empty_summary(df), df)
+    summary['fingerprint'] = fingerprint
+    return summary
+
+
+def save_summary(summary, path=SUMMARY_PATH):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(summary, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def write_summary(data_path=DATA_PATH, out_path=SUMMARY_PATH):
+    summary = build_summary(load_dataset(data_path), dataset_fingerprint(data_path))
+    save_summary(summary, out_path)
+    return summary
+
+
+def read_summary(path=SUMMARY_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        summary = json.load(f)
+    return summary if summary.get('version') == SUMMARY_VERSION else None
+
+
+def load_summary(data_path=DATA_PATH, path=SUMMARY_PATH):
+    """The stored summary when it matches the current dataset, else one rebuilt from the rows."""
+    fingerprint = dataset_fingerprint(data_path)
+    summary = read_summary(path)
+    if summary is not None and summary.get('fingerprint') == fingerprint:
+        return summary
+    return build_summary(load_dataset(data_path), fingerprint)
+
+
+# --- Derived statistics ---
+def brand_count(summary):
+    return len(summary['counts'].get('Brand', {}))
+
+
+def _dense(hist):
+    keys = np.fromiter((int(k) for k in hist), dtype=np.int64, count=len(hist))
+    counts = np.fromiter(hist.values(), dtype=np.float64, count=len(hist))
+    first = int(keys.min())
+    dense = np.zeros(int(keys.max()) - first + 1)
+    dense[keys - first] = counts
+    return first, dense
+
+
+def _quantiles(hist, axis, qs):
+    first, dense = _dense(hist)
+    cum = np.cumsum(dense)
+    out = []
+    for q in qs:
+        target = q * cum[-1]
+        i = int(np.searchsorted(cum, target))
+        below = cum[i - 1] if i else 0.0
+        frac = (target - below) / dense[i] if dense[i] else 0.0
+        out.append(axis['origin'] + (first + i + frac) * axis['width'])
+    return out
+
+
+# --- Chart accessors: (data, spec) pairs for st.vega_lite_chart ---
+def univariate_chart(summary, feature):
+    if not summary['numeric'][feature]:
+        counts = pd.Series(summary['counts'][feature]).sort_values(ascending=False, kind='stable')
+        counts = counts.head(charts.TOP_CATEGORIES)
+        return pd.DataFrame({'category': counts.index, 'count': counts.to_numpy()}), charts.bar_spec(feature)
+
+    axis, moments = summary['axes'][feature], summary['moments'][feature]
+    first, fine = _dense(summary['hist'][feature])
+    # Display bins: groups of HIST_GROUP fine bins, aligned to the fixed origin
+    start_group = first // HIST_GROUP
+    pad = first - start_group * HIST_GROUP
+    padded = np.concatenate([np.zeros(pad), fine])
+    padded = np.concatenate([padded, np.zeros(-len(padded) % HIST_GROUP)])
+    grouped = padded.reshape(-1, HIST_GROUP).sum(axis=1)
+    group_width = HIST_GROUP * axis['width']
+    starts = axis['origin'] + (start_group + np.arange(len(grouped))) * group_width
+    hist = pd.DataFrame({'start': starts, 'end': starts + group_width, 'count': grouped.astype(np.int64)})
+
+    # Smoothed density from the fine histogram, scaled to the displayed bin width
+    std = np.sqrt(moments['m2'] / summary['rows']) if summary['rows'] > 1 else 0.0
+    sigma = 1.06 * std * summary['rows'] ** -0.2 / axis['width']
+    if sigma > 0:
+        radius = int(min(np.ceil(3 * sigma), len(fine)))
+        kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+        fine = np.convolve(fine, kernel / kernel.sum(), mode='same')
+    centers = axis['origin'] + (first + np.arange(len(fine)) + 0.5) * axis['width']
+    density = pd.DataFrame({'x': centers, 'density': fine * HIST_GROUP})
+
+    spec = charts.histogram_spec(feature)
+    spec['datasets'] = {'hist': hist, 'density': density}
+    return None, spec
+
+
+def _grid_frame(summary, x, y):
+    transpose = _pair(x, y) not in summary['grids']
+    cells = summary['grids'][_pair(y, x) if transpose else _pair(x, y)]
+    ij = np.array([[int(v) for v in key.split(',')] for key in cells], dtype=np.int64).reshape(-1, 2)
+    if transpose:
+        ij = ij[:, ::-1]
+    ax, ay = summary['axes'][x], summary['axes'][y]
+    wx, wy = GRID_GROUP * ax['width'], GRID_GROUP * ay['width']
+    x0, y0 = ax['origin'] + ij[:, 0] * wx, ay['origin'] + ij[:, 1] * wy
+    return pd.DataFrame({'x_start': x0, 'x_end': x0 + wx, 'y_start': y0, 'y_end': y0 + wy,
+                         'count': np.fromiter(cells.values(), dtype=np.int64, count=len(cells))})
+
+
+def _box_frame(summary, category_col, value_col):
+    groups = summary['by_category'][_pair(category_col, value_col)]
+    top = pd.Series(summary['counts'][category_col]).sort_values(ascending=False, kind='stable')
+    rows = []
+    for category in top.head(charts.TOP_CATEGORIES).index:
+        entry = groups[category]
+        q1, median, q3 = _quantiles(entry['hist'], summary['axes'][value_col], [0.25, 0.5, 0.75])
+        # Interpolated quantiles are clamped to the exact per-category range
+        q1, median, q3 = (min(max(q, entry['min']), entry['max']) for q in (q1, median, q3))
+        rows.append({'category': category, 'min': entry['min'], 'q1': q1, 'median': median, 'q3': q3,
+                     'max': entry['max'], 'count': int(top[category])})
+    return pd.DataFrame(rows).sort_values('median', ascending=False)
+
+
+def _crosstab_frame(summary, x, y):
+    transpose = _pair(x, y) not in summary['crosstab']
+    if x == y:
+        counts = pd.Series(summary['counts'][x])
+        pairs = pd.DataFrame({'x': counts.index, 'y': counts.index, 'count': counts.to_numpy()})
+    else:
+        counts = pd.Series(summary['crosstab'][_pair(y, x) if transpose else _pair(x, y)])
+        split = counts.index.str.split(PAIR_SEP, n=1, expand=True)
+        a, b = split.get_level_values(0), split.get_level_values(1)
+        pairs = pd.DataFrame({'x': b if transpose else a, 'y': a if transpose else b, 'count': counts.to_numpy()})
+    keep_x = pd.Series(summary['counts'][x]).nlargest(charts.TOP_CATEGORIES, keep='first').index
+    keep_y = pd.Series(summary['counts'][y]).nlargest(charts.TOP_CATEGORIES, keep='first').index
+    return pairs[pairs['x'].isin(keep_x) & pairs['y'].isin(keep_y)].reset_index(drop=True)
+
+
+def bivariate_chart(summary, x_feature, y_feature):
+    kind = charts.bivariate_kind(summary['numeric'][x_feature], summary['numeric'][y_feature])
+    if kind == 'density':
+        data = _grid_frame(summary, x_feature, y_feature) if x_feature != y_feature else _diagonal(summary, x_feature)
+    elif kind == 'box':
+        data = _box_frame(summary, x_feature, y_feature)
+    elif kind == 'box_h':
+        data = _box_frame(summary, y_feature, x_feature)
+    else:
+        data = _crosstab_frame(summary, x_feature, y_feature)
+    return data, charts.bivariate_spec(kind, x_feature, y_feature)
+
+
+def _diagonal(summary, col):
+    axis = summary['axes'][col]
+    first, fine = _dense(summary['hist'][col])
+    keys = (first + np.arange(len(fine))) // GRID_GROUP
+    counts = pd.Series(fine).groupby(keys).sum()
+    counts = counts[counts > 0]
+    w = GRID_GROUP * axis['width']
+    start = axis['origin'] + counts.index.to_numpy() * w
+    return pd.DataFrame({'x_start': start, 'x_end': start + w, 'y_start': start, 'y_end': start + w,
+                         'count': counts.to_numpy().astype(np.int64)})
+
+
+def correlation_frame(summary):
+    num_cols = [c for c in summary['columns'] if summary['numeric'][c]]
+    m2 = {c: summary['moments'][c]['m2'] for c in num_cols}
+    rows = []
+    for x in num_cols:
+        for y in num_cols:
+            if x == y:
+                r = 1.0
+            else:
+                c = summary['comoments'].get(_pair(x, y), summary['comoments'].get(_pair(y, x)))
+                r = c / np.sqrt(m2[x] * m2[y]) if m2[x] > 0 and m2[y] > 0 else np.nan
+            rows.append({'x': x, 'y': y, 'corr': r})
+    return pd.DataFrame(rows)
+
+
+def correlation_chart(summary):
+    return correlation_frame(summary), charts.heatmap_spec()
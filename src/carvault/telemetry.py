@@ -0,0 +1,186 @@
+# Process-wide timing spans, counters and cache hit rates for the prediction path.
+#
+# `with span('predict'):` records the block's latency in a histogram per span name.
+# `render_prometheus()` returns everything in the Prometheus text format. The API
+# serves it at GET /metrics, and setting CARVAULT_METRICS_PORT makes the Streamlit
+# server expose it on that port. With CARVAULT_SPAN_LOG=1 every span is also logged
+# as one JSON line.
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+
+PREFIX = 'carvault'
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SPAN_LOG = os.environ.get('CARVAULT_SPAN_LOG', '0') == '1'
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    body = ','.join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+    return f'{{{body}}}'
+
+
+class Telemetry:
+    """Thread-safe span histograms and counters, plus collectors sampled at export time."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = defaultdict(float)
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name, amount=1, **labels):
+        with self._lock:
+            self.counters[name, tuple(sorted(labels.items()))] += amount
+
+    def counter(self, name, **labels):
+        with self._lock:
+            return self.counters.get((name, tuple(sorted(labels.items()))), 0.0)
+
+    def add_collector(self, name, collect):
+        """Register (or replace) a callable returning (metric, labels, value) samples of live state,
+        e.g. cache hit counters owned by another object."""
+        with self._lock:
+            self._collectors[name] = collect
+
+    def spans(self):
+        with self._lock:
+            return {name: (h.count, h.mean) for name, h in sorted(self.histograms.items())}
+
+    def render_prometheus(self):
+        with self._lock:
+            histograms = {name: (list(h.counts), h.sum, h.count) for name, h in self.histograms.items()}
+            counters = dict(self.counters)
+            collectors = list(self._collectors.values())
+        lines = [f'# TYPE {PREFIX}_span_seconds histogram']
+        for name, (counts, total, count) in sorted(histograms.items()):
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS + ('+Inf',), counts):
+                cumulative += n
+                lines.append(f'{PREFIX}_span_seconds_bucket{_labels({"span": name, "le": bound})} {cumulative}')
+            lines.append(f'{PREFIX}_span_seconds_sum{_labels({"span": name})} {total:.6f}')
+            lines.append(f'{PREFIX}_span_seconds_count{_labels({"span": name})} {count}')
+
+        samples = defaultdict(list)
+        for (name, labels), value in counters.items():
+            samples[name].append((dict(labels), value))
+        for collect in collectors:
+            try:
+                for name, labels, value in collect():
+                    samples[name].append((labels, value))
+            except Exception:
+                logger.exception("Telemetry collector failed")
+        for name in sorted(samples):
+            kind = 'counter' if name.endswith('_total') else 'gauge'
+            lines.append(f'# TYPE {PREFIX}_{name} {kind}')
+            for labels, value in samples[name]:
+                lines.append(f'{PREFIX}_{name}{_labels(labels)} {value:.15g}')
+        return '\n'.join(lines) + '\n'
+
+
+TELEMETRY = Telemetry()
+
+
+@contextmanager
+def span(name, **fields):
+    """Time a block into the `name` latency histogram (and a JSON log line with CARVAULT_SPAN_LOG=1).
+
+    The calling thread's CPU time is added to span_cpu_seconds_total, so work moved off a thread shows up.
+    """
+    start, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        TELEMETRY.observe(name, seconds)
+        TELEMETRY.inc('span_cpu_seconds_total', time.thread_time() - cpu, span=name)
+        if SPAN_LOG:
+            _span_logger().info(json.dumps({'span': name, 'ms': round(seconds * 1000, 3), **fields}))
+
+
+def _span_logger():
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def cache_samples(cache_name, hits, misses):
+    return [('cache_hits_total', {'cache': cache_name}, hits), ('cache_misses_total', {'cache': cache_name}, misses)]
+
+
+_server = {}
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None):
+    """Serve GET /metrics on `port` (default CARVAULT_METRICS_PORT) from a daemon thread, once per process."""
+    port = port or os.environ.get('CARVAULT_METRICS_PORT')
+    with _server_lock:
+        if not port or 'server' in _server:
+            return _server.get('server')
+        _server['server'] = _serve(int(port))
+    return _server['server']
+
+
+def _serve(port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = TELEMETRY.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('0.0.0.0', port), Handler)
+    threading.Thread(target=server.serve_forever, name='carvault-metrics', daemon=True).start()
+    return server
@@ -0,0 +1,133 @@
+import time
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import HalvingRandomSearchCV, KFold, RandomizedSearchCV, cross_val_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+from carvault.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+
+MODEL_FAMILIES = ['rf', 'xgb']
+ENCODINGS = ['onehot', 'ordinal']
+
+# Search spaces use the pipeline's 'regressor__' prefix
+SEARCH_SPACES = {
+    'rf': {
+        'regressor__n_estimators': [100, 200, 300],
+        'regressor__max_depth': [None, 12, 20, 30],
+        'regressor__min_samples_leaf': [1, 2, 4],
+        'regressor__max_features': [1.0, 0.5, 'sqrt'],
+    },
+    'xgb': {
+        'regressor__n_estimators': [300, 500, 800],
+        'regressor__max_depth': [4, 6, 8],
+        'regressor__learning_rate': [0.03, 0.05, 0.1],
+        'regressor__subsample': [0.7, 0.85, 1.0],
+        'regressor__colsample_bytree': [0.5, 0.8, 1.0],
+        'regressor__min_child_weight': [1, 3, 5],
+    },
+}
+
+
+def build_preprocessor(encoding='onehot'):
+    if encoding == 'onehot':
+        categorical = OneHotEncoder(handle_unknown='ignore')
+    elif encoding == 'ordinal':
+        # One code column per categorical feature: a 7-column dense matrix instead of ~300 sparse
+        # one-hot columns. Trees split on code ranges; unseen categories encode as -1.
+        categorical = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1, dtype=np.float32)
+    else:
+        raise ValueError(f"Unknown encoding: {encoding}")
+    # Preprocessor - must use 'num' and 'cat' as labels for naming consistency
+    return ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), NUMERIC_FEATURES),
+            ('cat', categorical, CATEGORICAL_FEATURES)
+        ]
+    )
+
+
+def build_regressor(family, seed=42, n_jobs=1):
+    if family == 'rf':
+        return RandomForestRegressor(n_estimators=100, random_state=seed, n_jobs=n_jobs)
+    if family == 'xgb':
+        from xgboost import XGBRegressor
+        return XGBRegressor(n_estimators=500, tree_method='hist', random_state=seed, n_jobs=n_jobs)
+    raise ValueError(f"Unknown model family: {family}")
+
+
+def build_pipeline(family='rf', seed=42, n_jobs=1, encoding='onehot'):
+    # Pipeline - must use 'preprocessor' and 'regressor' as labels
+    return Pipeline(steps=[
+        ('preprocessor', build_preprocessor(encoding)),
+        ('regressor', build_regressor(family, seed, n_jobs))
+    ])
+
+
+def regression_metrics(y_true, y_pred):
+    return {
+        'mae': float(mean_absolute_error(y_true, y_pred)),
+        'rmse': float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        'r2': float(r2_score(y_true, y_pred)),
+    }
+
+
+def search(family, X, y, strategy='random', n_iter=20, cv=5, n_jobs=-1, seed=42, encoding='onehot'):
+    """Cross-validated hyperparameter search for one model family, parallel across folds/candidates.
+
+    strategy='none' cross-validates the default hyperparameters only, so families stay comparable.
+    """
+    # Each candidate fits single-threaded; parallelism lives at the CV level to avoid oversubscription
+    pipeline = build_pipeline(family, seed, n_jobs=1, encoding=encoding)
+    folds = KFold(n_splits=cv, shuffle=True, random_state=seed)
+    if strategy == 'none':
+        start = time.perf_counter()
+        scores = -cross_val_score(pipeline, X, y, cv=folds, scoring='neg_root_mean_squared_error', n_jobs=n_jobs)
+        return {
+            'family': family,
+            'strategy': strategy,
+            'best_params': {},
+            'cv_rmse_mean': float(scores.mean()),
+            'cv_rmse_std': float(scores.std()),
+            'candidates': 1,
+            'seconds': round(time.perf_counter() - start, 2),
+        }
+    common = dict(cv=folds, scoring='neg_root_mean_squared_error', n_jobs=n_jobs, random_state=seed, refit=False)
+    if strategy == 'halving':
+        searcher = HalvingRandomSearchCV(pipeline, SEARCH_SPACES[family], n_candidates=n_iter, factor=3, **common)
+    else:
+        searcher = RandomizedSearchCV(pipeline, SEARCH_SPACES[family], n_iter=n_iter, **common)
+    start = time.perf_counter()
+    searcher.fit(X, y)
+    best = searcher.best_index_
+    return {
+        'family': family,
+        'strategy': strategy,
+        'best_params': searcher.best_params_,
+        'cv_rmse_mean': float(-searcher.cv_results_['mean_test_score'][best]),
+        'cv_rmse_std': float(searcher.cv_results_['std_test_score'][best]),
+        'candidates': len(searcher.cv_results_['params']),
+        'seconds': round(time.perf_counter() - start, 2),
+    }
+
+
+def grow(pipeline, X, y, n_new, n_jobs=1):
+    """Extend a fitted pipeline with `n_new` trees (RandomForest, warm start) or boosting rounds
+    (XGBoost) fitted on X, y only. The fitted preprocessor is reused unchanged, so the existing
+    trees keep their column layout; categories it has never seen encode as all zeros (one-hot) or -1 (ordinal)."""
+    Xt = pipeline.named_steps['preprocessor'].transform(X)
+    model = pipeline.named_steps['regressor']
+    if hasattr(model, 'estimators_'):
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new, n_jobs=n_jobs)
+        model.fit(Xt, y)
+        model.set_params(warm_start=False, n_jobs=1)
+    else:
+        booster = model.get_booster()
+        model.set_params(n_estimators=n_new, n_jobs=n_jobs)
+        model.fit(Xt, y, xgb_model=booster)
+        model.set_params(n_jobs=1)
+    return pipeline
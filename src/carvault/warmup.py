@@ -0,0 +1,93 @@
+# Prediction cache warm-up: the most requested input configurations, explained ahead of time.
+#
+# Traffic is dominated by a few Brand/Model/Fuel/Transmission/Ownership combinations, so the
+# training listings (or a request log) are counted per cell: that configuration at a given
+# Car Age and KM Driven rounded to the nearest of KM_LEVELS. The top-N cells are explained in
+# batches with the same exact TreeSHAP as the interactive path and saved next to the model
+# (warm_cache.npz). Every serving process seeds its explanation cache from that file on load.
+import json
+
+import numpy as np
+
+from carvault.explain import Explanation, explain_records, record_key
+from carvault.features import FEATURES
+
+CONFIG_COLUMNS = ['Brand', 'Model_Only', 'Fuel Type', 'Transmission Type', 'Ownership']
+KM_LEVELS = [10_000, 30_000, 50_000, 70_000, 100_000, 150_000]
+TOP_N = 200
+BATCH_ROWS = 32
+
+
+def bucket_km(km, levels=KM_LEVELS):
+    levels = np.asarray(levels)
+    km = np.asarray(km, dtype=np.float64)
+    return levels[np.abs(km[:, None] - levels[None, :]).argmin(axis=1)]
+
+
+def traffic_cells(traffic, km_levels=KM_LEVELS):
+    """Traffic rows as warm-up cells: the configuration, Car Age and bucketed KM Driven."""
+    cells = traffic[CONFIG_COLUMNS + ['Car Age']].astype(object).copy()
+    cells['KM Driven'] = bucket_km(traffic['KM Driven'].to_numpy(), km_levels)
+    return cells[FEATURES]
+
+
+def top_configurations(traffic, n=TOP_N, km_levels=KM_LEVELS):
+    """The n most frequent cells as model-ready records, most frequent first."""
+    counts = traffic_cells(traffic, km_levels).value_counts(sort=True)
+    return [dict(zip(FEATURES, cell)) for cell in counts.index[:n]]
+
+
+def _keys(frame):
+    return [record_key(dict(zip(FEATURES, row))) for row in frame[FEATURES].itertuples(index=False)]
+
+
+def coverage(records, traffic, km_levels=KM_LEVELS):
+    """Share of traffic rows the warmed records serve, at three levels of strictness.
+
+    exact:           the row's own input is cached (what the cache hit rate would be)
+    cells:           the row falls in a warmed configuration/age/KM bucket
+    configurations:  the row's Brand/Model/Fuel/Transmission/Ownership was warmed at some age and KM
+    """
+    warmed = {record_key(record) for record in records}
+    config_index = [FEATURES.index(c) for c in CONFIG_COLUMNS]
+    configs = {tuple(key[i] for i in config_index) for key in warmed}
+    keys = _keys(traffic)
+    exact = np.array([key in warmed for key in keys], dtype=bool)
+    cells = np.array([key in warmed for key in _keys(traffic_cells(traffic, km_levels))], dtype=bool)
+    in_config = np.array([tuple(key[i] for i in config_index) in configs for key in keys], dtype=bool)
+    share = lambda mask: float(mask.mean()) if len(mask) else 0.0  # noqa: E731
+    return {'rows': len(traffic), 'exact': share(exact), 'cells': share(cells), 'configurations': share(in_config)}
+
+
+def warm(predictor, explainer, records, batch_rows=BATCH_ROWS, progress=None):
+    """[(cache key, Explanation)] for every record, explained batch_rows at a time."""
+    entries = []
+    for start in range(0, len(records), batch_rows):
+        batch = records[start:start + batch_rows]
+        entries += zip(map(record_key, batch), explain_records(predictor, explainer, batch))
+        if progress is not None:
+            progress(len(entries))
+    return entries
+
+
+def save_warm_cache(entries, path):
+    keys = [list(key) for key, _ in entries]
+    explanations = [explanation for _, explanation in entries]
+    np.savez(
+        path,
+        keys=np.array(json.dumps(keys)),
+        price=np.array([e.price for e in explanations], dtype=np.float64),
+        base_value=np.array([e.base_value for e in explanations], dtype=np.float64),
+        shap_values=np.stack([e.shap_values for e in explanations]),
+        rows=np.stack([e.row for e in explanations]),
+    )
+
+
+def load_warm_cache(path):
+    with np.load(path) as data:
+        keys = json.loads(str(data['keys']))
+        price, base_value = data['price'], data['base_value']
+        shap_values, rows = data['shap_values'], data['rows']
+    return [(tuple(key), Explanation(price=float(price[i]), base_value=float(base_value[i]),
+                                     shap_values=shap_values[i], row=rows[i]))
+            for i, key in enumerate(keys)]
@@ -1,29 +1,27 @@
 import streamlit as st
-import pickle
 import pandas as pd
 import numpy as np
-import shap
-import base64
-
-# Function to get base64 of image for CSS
-def get_base64(bin_file):
-    with open(bin_file, 'rb') as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
-
-def set_bg(png_file):
-    bin_str = get_base64(png_file)
-    page_bg_img = f'''
-    <style>
-    .stApp {{
-        background-image: url("data:image/png;base64,{bin_str}");
-        background-size: cover;
-        background-position: center;
-        background-attachment: fixed;
-    }}
-    </style>
-    '''
-    st.markdown(page_bg_img, unsafe_allow_html=True)
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from carvault.features import FEATURES, missing_features
+from carvault.options import OPTIONS_PATH, load_option_index
+from carvault.batch import detect_format, read_columns, score_file
+from carvault.registry import REGISTRY_DIR
+from carvault.reload import ModelWatcher
+from carvault.explain import TOP_K, BatchExplainer
+from carvault.shap_force import render_force_plot
+from carvault.inference import INTERVAL_LEVEL, predict_with_interval, records_frame
+from carvault.inference import feature_names as get_feature_names
+from carvault.assets import inject_css, set_bg
+from carvault.dataset import DATA_PATH
+from carvault.cache_stats import CacheStats
+from carvault.comparables import TOP_K as COMPARABLES_K, ComparablesIndex
+from carvault.charts import curves_spec
+from carvault.sensitivity import DRIVETRAIN, MILEAGE, PRICE_COLUMN, sweep
+from carvault.shared import process_memory, shared_dataset
+from carvault.telemetry import TELEMETRY, span, start_metrics_server
 
 # Set the cinematic background
 set_bg('src/bg_prediction_v2.png')
@@ -36,230 +34,179 @@ st.set_page_config(
 )
 
 # --- Custom CSS for 10/10 Premium UI ---
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Outfit:wght@300;400;600;900&display=swap');
-
-    :root {
-        --primary: #00d2ff;
-        --secondary: #92fe9d;
-        --bg-dark: #0f172a;
-        --glass: rgba(255, 255, 255, 0.05);
-        --glass-border: rgba(255, 255, 255, 0.1);
-        --text-glow: 0 0 15px rgba(0, 210, 255, 0.5);
-    }
-
-    .stApp {
-        font-family: 'Outfit', sans-serif;
-        color: #ffffff;
-    }
-
-    /* Hide specific default elements but preserve sidebar toggle */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    
-    /* Ensure Sidebar Toggle is always visible and premium */
-    button[kind="header"] {
-        color: #00d2ff !important;
-        background-color: rgba(255, 255, 255, 0.05) !important;
-        border-radius: 50% !important;
-    }
-    /* Hyper-dark Cinematic Overlay for extreme readability */
-    .stApp::before {
-        content: "";
-        position: fixed;
-        top: 0; left: 0; width: 100%; height: 100%;
-        background: radial-gradient(circle at center, rgba(15, 23, 42, 0.95), rgba(2, 6, 23, 0.98));
-        backdrop-filter: blur(8px);
-        z-index: -1;
-    }
-
-    /* Solidified Containers for maximum clarity */
-    .form-container {
-        background: rgba(30, 41, 59, 0.96); /* Almost opaque */
-        backdrop-filter: blur(20px);
-        padding: 3rem;
-        border-radius: 24px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        box-shadow: 0 20px 50px rgba(0, 0, 0, 0.9);
-        margin-bottom: 2rem;
-    }
-
-    h1, h2, h3 {
-        color: var(--primary) !important;
-        font-weight: 700 !important;
-        text-shadow: 0 4px 10px rgba(0,0,0,0.5);
-    }
-    /* High-contrast labels within grids */
-    .stSelectbox label, .stNumberInput label {
-        color: var(--primary) !important;
-        font-weight: 700 !important;
-        font-size: 1rem !important;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        margin-bottom: 0.5rem !important;
-        display: block;
-        text-shadow: 0 4px 10px rgba(0,0,0,0.8);
-    }
-
-    /* Opaque Input Widgets */
-    section[data-testid="stWidgetLabel"] p {
-        color: #00d2ff !important;
-        font-weight: 800 !important;
-    }
-
-    /* Ensure tables/dataframes are solid */
-    div.stDataFrame, div.stTable {
-        background: #1e293b !important;
-        border-radius: 12px !important;
-        padding: 10px !important;
-        border: 1px solid rgba(255, 255, 255, 0.2) !important;
-    }
-    
-    p, li, span, label {
-        color: #ffffff !important;
-        font-weight: 500 !important;
-        text-shadow: 0 2px 4px rgba(0,0,0,0.6);
-    }
-
-    /* Input Widgets */
-    div[data-baseweb="select"] > div, 
-    input[type="number"] {
-        background-color: rgba(255, 255, 255, 0.03) !important;
-        border: 1px solid var(--glass-border) !important;
-        border-radius: 12px !important;
-        color: white !important;
-        height: 3rem !important;
-    }
-
-    label {
-        color: #94a3b8 !important;
-        font-weight: 600 !important;
-        margin-bottom: 0.5rem !important;
-    }
-
-    /* Premium Predict Button */
-    div[data-testid="stFormSubmitButton"] > button {
-        background: linear-gradient(90deg, #00d2ff, #3a7bd5) !important;
-        color: #fff !important;
-        font-weight: 700 !important;
-        font-size: 1.1rem !important;
-        border-radius: 14px !important;
-        border: none !important;
-        padding: 0.75rem 2rem !important;
-        width: 100% !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 4px 15px rgba(0, 210, 255, 0.3) !important;
-    }
-    
-    div[data-testid="stFormSubmitButton"] > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 25px rgba(0, 210, 255, 0.5) !important;
-    }
+inject_css('base', 'prediction')
 
-    /* Explanation Box */
-    .explain-box {
-        background: rgba(0, 210, 255, 0.05);
-        border: 1px solid rgba(0, 210, 255, 0.2);
-        padding: 1.5rem;
-        border-radius: 16px;
-        margin-top: 2rem;
-    }
 
-</style>
-""", unsafe_allow_html=True)
+# --- Caching and Resource Loading ---
+@st.cache_resource
+def get_cache_stats():
+    stats = CacheStats()
+    TELEMETRY.add_collector('prediction_caches', stats.samples)
+    start_metrics_server()  # no-op unless CARVAULT_METRICS_PORT is set
+    return stats
 
+stats = get_cache_stats()
+TELEMETRY.inc('script_runs_total', scope='page')
 
-# --- Caching and Resource Loading ---
 @st.cache_resource
-def load_model_and_explainer(model_path):
+def get_explain_pool():
+    # Shared by all sessions, so a burst of submissions queues instead of starting a thread each
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='carvault-shap')
+
+@stats.counted(st.cache_resource)
+def load_model_and_explainer(registry_dir):
+    # One watcher per process: new models load in the background and are swapped in
+    # atomically, so the server never needs a restart to pick them up. shap (~1.3 s to
+    # import) and the explainer are only loaded when the first explanation is shown.
     try:
-        with open(model_path, 'rb') as file:
-            pipeline = pickle.load(file)
-        
-        preprocessor = pipeline.named_steps['preprocessor']
-        model = pipeline.named_steps['regressor']
-        explainer = shap.TreeExplainer(model)
-        
-        return pipeline, preprocessor, explainer
+        return ModelWatcher(registry_dir, warm_explainer=False).start()
     except Exception:
-        return None, None, None
+        return None
 
-@st.cache_data
 def load_data(data_path):
+    # One memory-mapped frame per process, shared by every session (and every replica's page cache)
+    try:
+        with span('load_data'):
+            return shared_dataset(data_path)
+    except Exception:
+        return None
+
+@stats.counted(st.cache_resource(max_entries=2))
+def load_options(version, data_path, _model):
+    # Dropdown lists are built once per model version (from the index registered with it when present)
+    if _model.options is not None:
+        return _model.options
     try:
-        return pd.read_csv(data_path)
+        return load_option_index(OPTIONS_PATH, df=load_data(data_path))
     except Exception:
         return None
 
-# Load resources
-pipeline, preprocessor, explainer = load_model_and_explainer('src/car_price_predictor.pkl')
-df = load_data('src/cars24_cleaned.csv')
+@stats.counted(st.cache_resource(max_entries=2))
+def load_comparables(version, data_path, _model):
+    # Registered with the model; older versions get one built from the dataset once per process
+    if _model.comparables is not None:
+        return _model.comparables
+    df = load_data(data_path)
+    return ComparablesIndex.from_frame(df) if df is not None else None
+
+@stats.counted(st.cache_data(max_entries=256, ttl=3600))
+def cached_sweep(version, config, _predictor, _options):
+    # Keyed by the car without its age (the grid already spans every age), so changing only the year is a hit
+    with span('sensitivity_sweep'):
+        return sweep(_predictor, dict(config), _options)
+
+def show_telemetry():
+    # Rendered last so it includes this rerun's spans
+    st.sidebar.markdown("---")
+    with st.sidebar.expander("Telemetry"):
+        for name, (count, mean) in TELEMETRY.spans().items():
+            st.caption(f"{name}: {count} × {mean * 1000:.1f} ms avg")
+        if serving is not None:
+            st.caption(f"explanations: {serving.explanations.hits} hits / {serving.explanations.misses} misses")
+        for name, (hits, misses) in stats.summary().items():
+            st.caption(f"{name}: {hits} hits / {misses} misses")
+        memory = process_memory()
+        st.caption(f"process {os.getpid()}: RSS {memory['rss'] / 2**20:.0f} MB, "
+                   f"PSS {memory['pss'] / 2**20:.0f} MB, private {memory['uss'] / 2**20:.0f} MB")
+
+# Load resources: one consistent snapshot of the serving model per rerun
+watcher = load_model_and_explainer(REGISTRY_DIR)
+serving = watcher.current if watcher is not None else None
+pipeline = serving.model.predictor if serving is not None else None
+preprocessor = serving.model.preprocessor if serving is not None else None
+df = load_data(DATA_PATH)
+options = load_options(serving.version, DATA_PATH, serving.model) if serving is not None else None
 
 # --- App UI ---
 st.markdown("<h1 style='text-align: center; margin-bottom: 2rem;'>🚀 Neural Engine Predictor</h1>", unsafe_allow_html=True)
 
-if pipeline is None or df is None:
+if pipeline is None or df is None or options is None:
     st.error("⚠️ **System Error:** Neural Core Offline. Please verify model and dataset integrity.")
     st.stop()
 
-# --- Prediction Interface ---
-st.markdown('<div class="form-container" style="background: rgba(15, 23, 42, 0.98); border: 2px solid rgba(0, 210, 255, 0.3);">', unsafe_allow_html=True)
-st.markdown("<h2 style='text-align: center; color: #00d2ff; font-size: 2.5rem; margin-bottom: 2rem;'>📝 Asset Specification Portal</h2>", unsafe_allow_html=True)
-
-# Grid Layout for Inputs
-col1, col2 = st.columns(2, gap="large")
+st.sidebar.caption(f"Model version: {serving.version}")
 
-with col1:
-    st.markdown('<div style="background: rgba(0,0,0,0.3); padding: 1.5rem; border-radius: 16px; border: 1px solid rgba(255,255,255,0.1); margin-bottom: 1.5rem;">', unsafe_allow_html=True)
-    brand = st.selectbox("🏎️ Asset Brand", sorted(df['Brand'].dropna().unique()))
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown('<div style="background: rgba(0,0,0,0.3); padding: 1.5rem; border-radius: 16px; border: 1px solid rgba(255,255,255,0.1); margin-bottom: 1.5rem;">', unsafe_allow_html=True)
-    model = st.selectbox("📂 Model Series", sorted(df[df['Brand'] == brand]['Model_Only'].unique()))
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown('<div style="background: rgba(0,0,0,0.3); padding: 1.5rem; border-radius: 16px; border: 1px solid rgba(255,255,255,0.1); margin-bottom: 1.5rem;">', unsafe_allow_html=True)
-    transmission = st.selectbox("⚙️ Transmission Module", sorted(df['Transmission Type'].unique()))
-    st.markdown('</div>', unsafe_allow_html=True)
+mode = st.radio("Valuation Mode", ["🚗 Single Asset", "📦 Batch Valuation"], horizontal=True, label_visibility="collapsed")
 
-with col2:
-    st.markdown('<div style="background: rgba(0,0,0,0.3); padding: 1.5rem; border-radius: 16px; border: 1px solid rgba(255,255,255,0.1); margin-bottom: 1.5rem;">', unsafe_allow_html=True)
-    fuel = st.selectbox("🔋 Energy Source", sorted(df['Fuel Type'].unique()))
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown('<div style="background: rgba(0,0,0,0.3); padding: 1.5rem; border-radius: 16px; border: 1px solid rgba(255,255,255,0.1); margin-bottom: 1.5rem;">', unsafe_allow_html=True)
-    year = st.number_input("📅 Vintage (Year)", min_value=2010, max_value=2024, value=2018)
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown('<div style="background: rgba(0,0,0,0.3); padding: 1.5rem; border-radius: 16px; border: 1px solid rgba(255,255,255,0.1); margin-bottom: 1.5rem;">', unsafe_allow_html=True)
-    km = st.number_input("🛣️ Total Usage (KM)", min_value=100, max_value=500000, value=50000, step=1000)
+# --- Batch Valuation ---
+if mode == "📦 Batch Valuation":
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown("<h2 style='text-align: center; color: #00d2ff; font-size: 2.5rem; margin-bottom: 1rem;'>📦 Fleet Valuation Portal</h2>", unsafe_allow_html=True)
+    st.markdown(f"<p style='text-align: center; color: #cbd5e1;'>Upload a CSV or Parquet stock sheet with the columns: <b>{', '.join(FEATURES)}</b>.</p>", unsafe_allow_html=True)
+
+    uploaded = st.file_uploader("Stock Sheet", type=["csv", "parquet"])
+    if uploaded is not None:
+        fmt = detect_format(uploaded.name)
+        missing = missing_features(read_columns(uploaded, fmt))
+        if missing:
+            st.error(f"⚠️ Missing required columns: {', '.join(missing)}")
+        else:
+            explain = st.checkbox(f"🧠 Include the top {TOP_K} price drivers per car (SHAP)")
+            if st.button("🚀 Execute Batch Valuation", use_container_width=True):
+                progress = st.progress(0.0, text="Scoring...")
+                total = max(uploaded.size, 1)
+                # Deleted once closed: by this session's next batch run, or when the session ends
+                scored = tempfile.NamedTemporaryFile(prefix='carvault_valuation_', suffix=f".{fmt}")
+                try:
+                    with span('score_file', format=fmt):
+                        report = score_file(
+                            pipeline, uploaded, scored.name, fmt=fmt, options=options,
+                            explain=BatchExplainer(pipeline, serving.explainer) if explain else None,
+                            progress=lambda r: progress.progress(min(uploaded.tell() / total, 1.0), text=f"{r.rows:,} rows scored"),
+                        )
+                    TELEMETRY.inc('predicted_rows_total', report.rows, source='batch')
+                    previous = st.session_state.get('batch_result')
+                    if previous is not None:
+                        previous[1].close()
+                    st.session_state['batch_result'] = (uploaded.name, scored, fmt, report)
+                except ValueError as e:
+                    scored.close()
+                    st.error(f"⚠️ {e}")
+                progress.empty()
+
+    result = st.session_state.get('batch_result')
+    if result is not None:
+        name, scored, fmt, report = result
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Rows Priced", f"{report.scored:,}")
+        m2.metric("Rows Skipped", f"{report.skipped:,}")
+        m3.metric("Unseen Configs", f"{report.unknown:,}")
+        m4.metric("Throughput", f"{report.rows_per_sec:,.0f} rows/s")
+        with open(scored.name, 'rb') as f:
+            st.download_button(
+                "⬇️ Download Priced Stock Sheet", f,
+                file_name=f"{os.path.splitext(name)[0]}_priced.{fmt}",
+                use_container_width=True,
+            )
     st.markdown('</div>', unsafe_allow_html=True)
+    show_telemetry()
+    st.stop()
 
-st.markdown('<div style="background: rgba(0,0,0,0.3); padding: 1.5rem; border-radius: 16px; border: 1px solid rgba(255,255,255,0.1); margin-bottom: 2rem;">', unsafe_allow_html=True)
-owner = st.selectbox("👤 Ownership Heritage", sorted(df['Ownership'].unique()))
-st.markdown('</div>', unsafe_allow_html=True)
-
-submitted = st.button("🚀 Execute Prediction Analysis", use_container_width=True)
-st.markdown('</div>', unsafe_allow_html=True)
-
-
-# --- Prediction Output ---
-if submitted:
-    current_year = 2025 
-    car_age = current_year - year
-    
-    input_data = pd.DataFrame({
-        'KM Driven': [km],
-        'Fuel Type': [fuel],
-        'Transmission Type': [transmission],
-        'Ownership': [owner],
-        'Brand': [brand],
-        'Model_Only': [model],
-        'Car Age': [car_age]
-    })
-    
-    predicted_price = pipeline.predict(input_data)[0]
+# --- Prediction Interface ---
+BOX = '<div style="background: rgba(0,0,0,0.3); padding: 1.5rem; border-radius: 16px; border: 1px solid rgba(255,255,255,0.1); margin-bottom: 1.5rem;">'
+
+def boxed(container, widget, *args, **kwargs):
+    container.markdown(BOX, unsafe_allow_html=True)
+    value = widget(*args, **kwargs)
+    container.markdown('</div>', unsafe_allow_html=True)
+    return value
+
+def render_valuation(record, brand, model, km, car_age, current_year):
+    # SHAP (and the first shap import) runs on the pool while the price, curves and listings render
+    shap_future = get_explain_pool().submit(serving.explain, record)
+
+    # Price and the spread of the individual trees' prices come from one pass over the forest
+    with span('predict_interval'):
+        prices, lower, upper = predict_with_interval(pipeline, records_frame([record]))
+    predicted_price = float(prices[0])
+    TELEMETRY.inc('predicted_rows_total', 1, source='app')
+    range_html = ""
+    if lower is not None:
+        range_html = (
+            f"<p style='font-size: 1.2rem; color: #cbd5e1; margin: 0.5rem 0 0 0;'>"
+            f"Likely range ₹ {lower[0]:.2f} – {upper[0]:.2f} Lakhs "
+            f"<span style='color: #94a3b8;'>({INTERVAL_LEVEL:.0%} of trees)</span></p>"
+        )
     
     st.markdown("""
         <div style='text-align: center; margin-top: 3rem;'>
@@ -275,11 +222,27 @@ if submitted:
             <p style="font-size: 4rem; font-weight: 900; color: white; margin: 0; text-shadow: 0 0 20px rgba(0,210,255,0.5);">
                 ₹ {predicted_price:.2f} <span style='font-size: 1.5rem; color: #94a3b8;'>Lakhs</span>
             </p>
+            {range_html}
         </div>
         """,
         unsafe_allow_html=True
     )
 
+    # --- What-If Sensitivity ---
+    # Every age/mileage/drivetrain variant of this car, priced in one predict call
+    config = tuple((k, v) for k, v in record.items() if k != 'Car Age')
+    grid = cached_sweep(serving.version, config, pipeline, options)
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown("<h2 style='margin-top: 0rem;'>📉 What-If Depreciation</h2>", unsafe_allow_html=True)
+    by_mileage, by_drivetrain = st.tabs(["By mileage", f"By fuel & transmission (at {km:,} km)"])
+    for tab, name, title in [(by_mileage, MILEAGE, f"{brand} {model}: price by age and KM driven"),
+                             (by_drivetrain, DRIVETRAIN, f"{brand} {model}: price by age and drivetrain")]:
+        curves = grid.loc[grid['Sweep'] == name, ['Car Age', 'Curve', PRICE_COLUMN]].astype({'Car Age': int})
+        with tab:
+            st.vega_lite_chart(curves, curves_spec(title, 'Car Age', PRICE_COLUMN, 'Curve', marker=car_age),
+                               width='stretch', theme=None)
+    st.markdown('</div>', unsafe_allow_html=True)
+
     # --- SHAP Interpretation ---
     st.markdown('<div class="form-container">', unsafe_allow_html=True)
     st.markdown("<h2 style='margin-top: 0rem;'>🧠 Neural Interpretability (SHAP)</h2>", unsafe_allow_html=True)
@@ -297,40 +260,74 @@ if submitted:
         unsafe_allow_html=True
     )
 
-    # SHAP Logic
-    input_transformed = preprocessor.transform(input_data)
-    if hasattr(input_transformed, "toarray"):
-        input_transformed = input_transformed.toarray()
-    input_transformed = input_transformed.astype(float)
-
-    try:
-        feature_names = preprocessor.get_feature_names_out()
-    except Exception:
-        num_features = list(preprocessor.named_transformers_['num'].feature_names_in_)
-        ohe_transformer = preprocessor.named_transformers_['cat']
-        cat_features_original = list(ohe_transformer.feature_names_in_)
-        cat_features_generated = []
-        for i, categories in enumerate(ohe_transformer.categories_):
-            original_feature_name = cat_features_original[i]
-            for category in categories:
-                cat_features_generated.append(f"{original_feature_name}_{category}")
-        feature_names = num_features + cat_features_generated
-    
-    shap_values = explainer.shap_values(input_transformed)
-    input_transformed_df = pd.DataFrame(input_transformed, columns=feature_names)
-
-    force_plot = shap.force_plot(
-        explainer.expected_value,
-        shap_values[0, :],
-        input_transformed_df.iloc[0],
-        matplotlib=False,
-        text_rotation=0,
-        plot_cmap=["#00d2ff", "#ff4b4b"]
-    )
-    
-    shap_html = f"<div style='background: white; border-radius: 12px; padding: 20px; margin-top: 2rem;'>{shap.getjs()}{force_plot.html()}</div>"
-    st.components.v1.html(shap_html, height=200, scrolling=True)
-    
+    # Filled in once the pool has the explanation; everything below is already on screen by then
+    shap_slot = st.empty()
+    shap_slot.info("⏳ Computing SHAP price drivers...")
     st.markdown('</div>', unsafe_allow_html=True)
 
+    # --- Comparable Listings ---
+    comparables = load_comparables(serving.version, DATA_PATH, serving.model)
+    if comparables is not None:
+        with span('comparables'):
+            similar = comparables.query(record, k=COMPARABLES_K)
+        st.markdown('<div class="form-container">', unsafe_allow_html=True)
+        st.markdown(f"<h2 style='margin-top: 0rem;'>🔎 Similar {brand} {model} Listings</h2>", unsafe_allow_html=True)
+        if similar.empty:
+            st.info("No listings of this model in the dataset.")
+        else:
+            similar.insert(0, 'Year', current_year - similar['Car Age'])
+            st.dataframe(
+                similar.drop(columns=['Brand', 'Model_Only', 'Car Age', 'Distance']),
+                hide_index=True, use_container_width=True,
+            )
+        st.markdown('</div>', unsafe_allow_html=True)
 
+    # SHAP Logic
+    with span('shap_wait'):
+        explanation = shap_future.result()
+    with shap_slot.container():
+        render_force_plot(explanation, get_feature_names(preprocessor), plot_cmap=["#00d2ff", "#ff4b4b"])
+
+# Inputs live in a form inside a fragment: editing a field reruns nothing, and picking a brand
+# or submitting reruns only this function, not the background, CSS and resource loading above.
+@st.fragment
+def single_asset():
+    TELEMETRY.inc('script_runs_total', scope='valuation')
+    with span('valuation_fragment'):
+        st.markdown('<div class="form-container" style="background: rgba(15, 23, 42, 0.98); border: 2px solid rgba(0, 210, 255, 0.3);">', unsafe_allow_html=True)
+        st.markdown("<h2 style='text-align: center; color: #00d2ff; font-size: 2.5rem; margin-bottom: 2rem;'>📝 Asset Specification Portal</h2>", unsafe_allow_html=True)
+
+        # Brand sits outside the form so the model list follows it
+        brand = boxed(st, st.selectbox, "🏎️ Asset Brand", options['Brand'])
+
+        with st.form("valuation", border=False):
+            # Grid Layout for Inputs
+            col1, col2 = st.columns(2, gap="large")
+            model = boxed(col1, col1.selectbox, "📂 Model Series", options['models_by_brand'][brand])
+            transmission = boxed(col1, col1.selectbox, "⚙️ Transmission Module", options['Transmission Type'])
+            fuel = boxed(col2, col2.selectbox, "🔋 Energy Source", options['Fuel Type'])
+            year = boxed(col2, col2.number_input, "📅 Vintage (Year)", min_value=2010, max_value=2024, value=2018)
+            km = boxed(col1, col1.number_input, "🛣️ Total Usage (KM)", min_value=100, max_value=500000, value=50000, step=1000)
+            owner = boxed(col2, col2.selectbox, "👤 Ownership Heritage", options['Ownership'])
+
+            submitted = st.form_submit_button("🚀 Execute Prediction Analysis", use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # --- Prediction Output ---
+        if submitted:
+            current_year = 2025 
+            car_age = current_year - year
+            
+            record = {
+                'KM Driven': km,
+                'Fuel Type': fuel,
+                'Transmission Type': transmission,
+                'Ownership': owner,
+                'Brand': brand,
+                'Model_Only': model,
+                'Car Age': car_age
+            }
+            render_valuation(record, brand, model, km, car_age, current_year)
+
+single_asset()
+show_telemetry()
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from carvault.features import TARGET  # noqa: E402
+
+
+def listings(n=600, seed=0):
+    """Synthetic listings with enough models that the one-hot output stays sparse, like the real data."""
+    rng = np.random.default_rng(seed)
+    models = {f'Brand{b}': [f'Model{b}{m}' for m in range(5)] for b in range(6)}
+    brands = rng.choice(list(models), n)
+    df = pd.DataFrame({
+        'KM Driven': rng.integers(1_000, 150_000, n),
+        'Ownership': rng.integers(1, 4, n),
+        'Car Age': rng.integers(0, 15, n),
+        'Fuel Type': rng.choice(['Petrol', 'Diesel', 'CNG'], n),
+        'Transmission Type': rng.choice(['Manual', 'Auto'], n),
+        'Brand': brands,
+        'Model_Only': [rng.choice(models[b]) for b in brands],
+    })
+    df[TARGET] = 12 - 0.6 * df['Car Age'] - df['KM Driven'] / 50_000 + rng.normal(0, 0.5, n)
+    return df
+
+
+@pytest.fixture(scope='session')
+def data():
+    return listings()
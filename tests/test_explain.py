@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from carvault.explain import BatchExplainer, explain_record, explain_records
+from carvault.features import FEATURES, TARGET
+from carvault.inference import load_explainer
+from carvault.training import MODEL_FAMILIES, build_pipeline
+
+
+@pytest.mark.parametrize('family', MODEL_FAMILIES)
+def test_explanation_price_matches_pipeline(family, data):
+    pytest.importorskip('shap')
+    if family == 'xgb':
+        pytest.importorskip('xgboost')
+    pipeline = build_pipeline(family).set_params(regressor__n_estimators=20).fit(data[FEATURES], data[TARGET])
+    explainer = load_explainer(pipeline)
+    X = data[FEATURES].iloc[:8].astype(object)
+    assert hasattr(pipeline.named_steps['preprocessor'].transform(X), 'tocsr')
+    expected = pipeline.predict(X)
+    records = X.to_dict('records')
+
+    for record, price in zip(records, expected):
+        explanation = explain_record(pipeline, explainer, record)
+        assert explanation.price == price
+        assert explanation.base_value + explanation.shap_values.sum() == pytest.approx(price, abs=1e-4)
+    assert [e.price for e in explain_records(pipeline, explainer, records)] == expected.tolist()
+
+    contributions = BatchExplainer(pipeline, explainer, exact=True).contributions(X)
+    np.testing.assert_allclose(explainer.expected_value + contributions.sum(axis=1), expected, atol=1e-4)
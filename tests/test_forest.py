@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from carvault.features import FEATURES, TARGET
+from carvault.forest import COMPILED_MAX_ROWS, CompiledForest, CompiledPipeline
+from carvault.inference import predict_with_interval
+from carvault.training import ENCODINGS, build_pipeline
+
+
+@pytest.fixture(scope='module', params=ENCODINGS)
+def compiled(request, data):
+    pipeline = build_pipeline('rf', encoding=request.param).set_params(regressor__n_estimators=10)
+    pipeline.fit(data[FEATURES], data[TARGET])
+    forest = CompiledForest.from_estimator(pipeline.named_steps['regressor'])
+    return pipeline, CompiledPipeline(pipeline, forest)
+
+
+@pytest.mark.parametrize('rows', [1, COMPILED_MAX_ROWS + 72])
+def test_compiled_pipeline_matches_sklearn(compiled, data, rows):
+    pipeline, predictor = compiled
+    assert predictor.encoder is not None
+    X = data[FEATURES].iloc[:rows].astype(object)
+    assert np.allclose(predictor.predict(X), pipeline.predict(X))
+    assert np.allclose(predict_with_interval(predictor, X)[0], pipeline.predict(X))
+
+
+@pytest.mark.parametrize('rows', [1, COMPILED_MAX_ROWS + 72])
+def test_forest_only_pipeline_matches_sklearn(compiled, data, rows):
+    pipeline, predictor = compiled
+    forest_only = CompiledPipeline.forest_only(pipeline.named_steps['preprocessor'], predictor.forest)
+    X = data[FEATURES].iloc[:rows].astype(object)
+    assert np.allclose(forest_only.predict(X), pipeline.predict(X))
+    assert np.allclose(predict_with_interval(forest_only, X)[0], pipeline.predict(X))
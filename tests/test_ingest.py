@@ -0,0 +1,73 @@
+import math
+import os
+
+import pandas as pd
+import pytest
+
+from carvault.dataset import COLUMNS, CSV_PATH, convert_csv, dataset_fingerprint, read_table
+from carvault.ingest import ingest
+from carvault.summary import build_summary, read_summary, save_summary
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A copy of the dataset artifact with its own partitions directory and a current summary."""
+    paths = {'data_path': str(tmp_path / 'cars24.feather'), 'partitions_dir': str(tmp_path / 'partitions'),
+             'summary_path': str(tmp_path / 'summary.json')}
+    convert_csv(os.path.join(ROOT, CSV_PATH), paths['data_path'])
+    save_summary(rebuilt_summary(paths), paths['summary_path'])
+    return paths
+
+
+def rebuilt_summary(paths):
+    df = read_table(paths['data_path'], partitions_dir=paths['partitions_dir']).to_pandas()
+    return build_summary(df, dataset_fingerprint(paths['data_path'], paths['partitions_dir']))
+
+
+def new_listings(store, n=200):
+    base = read_table(store['data_path'], partitions_dir=None).to_pandas()[COLUMNS]
+    batch = base.sample(n, random_state=0).reset_index(drop=True)
+    batch[COLUMNS[0]] = batch[COLUMNS[0]] + 7  # shifted KM Driven: rows the dataset has never seen
+    return base, batch
+
+
+def assert_same(merged, rebuilt, path='summary'):
+    if isinstance(rebuilt, dict):
+        assert merged.keys() == rebuilt.keys(), path
+        for key in rebuilt:
+            assert_same(merged[key], rebuilt[key], f"{path}[{key!r}]")
+    elif isinstance(rebuilt, list):
+        assert len(merged) == len(rebuilt), path
+        for i, (a, b) in enumerate(zip(merged, rebuilt)):
+            assert_same(a, b, f"{path}[{i}]")
+    elif isinstance(rebuilt, float) and not math.isnan(rebuilt):
+        assert merged == pytest.approx(rebuilt, rel=1e-9, abs=1e-9), path
+    elif isinstance(rebuilt, float):
+        assert math.isnan(merged), path
+    else:
+        assert merged == rebuilt, path
+
+
+def test_merged_summary_matches_full_rebuild(store):
+    _, batch = new_listings(store)
+    report = ingest(batch, **store)
+    assert report.added == len(batch)
+
+    merged = read_summary(store['summary_path'])
+    rebuilt_path = store['summary_path'] + '.rebuilt'
+    save_summary(rebuilt_summary(store), rebuilt_path)  # same JSON round trip as the merged copy
+    assert_same(merged, read_summary(rebuilt_path))
+
+
+def test_duplicate_rows_are_dropped(store):
+    base, batch = new_listings(store)
+    seen = base.head(30)
+    report = ingest(pd.concat([batch, batch.head(20), seen], ignore_index=True), **store)
+    assert (report.received, report.duplicates, report.added) == (250, 50, 200)
+
+    again = ingest(batch, **store)
+    assert (again.duplicates, again.added) == (len(batch), 0)
+    assert read_table(store['data_path'], partitions_dir=store['partitions_dir']).num_rows == len(base) + 200
+
@@ -0,0 +1,24 @@
+import pytest
+
+from carvault.features import FEATURES, TARGET
+from carvault.registry import register
+from carvault.reload import ModelWatcher
+from carvault.training import build_pipeline
+
+
+def fitted(data, n_estimators):
+    return build_pipeline('rf').set_params(regressor__n_estimators=n_estimators).fit(data[FEATURES], data[TARGET])
+
+
+def test_promoted_model_is_swapped_in_with_its_explainer_built(data, tmp_path):
+    pytest.importorskip('shap')
+    registry = str(tmp_path / 'models')
+    first = register(fitted(data, 5), registry_dir=registry)
+    watcher = ModelWatcher(registry, warm_explainer=False)  # as the app and API create it
+    assert watcher.current.version == first.version
+    assert not watcher.current.explainer_ready
+
+    second = register(fitted(data, 6), registry_dir=registry)
+    assert watcher.check()
+    assert watcher.current.version == second.version
+    assert watcher.current.explainer_ready
@@ -1,62 +1,154 @@
-import pandas as pd
-import pickle
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.compose import ColumnTransformer
-
-# Load data
-df = pd.read_csv('src/cars24_cleaned.csv')
-
-# Load data and explicitly define column names to avoid hidden character issues
-df = pd.read_csv('src/cars24_cleaned.csv')
-
-# Standard names we want
-std_columns = ['index', 'KM Driven', 'Fuel Type', 'Transmission Type', 'Ownership', 
-               'Selling Price (in Lakhs)', 'Brand', 'Model_Only', 'Car Age']
-
-# Force rename all columns based on order
-if len(df.columns) == len(std_columns):
-    df.columns = std_columns
-else:
-    print(f"Warning: Expected {len(std_columns)} columns, found {len(df.columns)}")
-    # Just clean whatever we have
-    df.columns = df.columns.str.replace('\r', '', regex=False).str.replace('\n', '', regex=False).str.strip()
-
-# Numeric and categorical features (names now guaranteed to match app)
-numeric_features = ['KM Driven', 'Ownership', 'Car Age']
-categorical_features = ['Fuel Type', 'Transmission Type', 'Brand', 'Model_Only']
-target = 'Selling Price (in Lakhs)'
-
-X = df[numeric_features + categorical_features]
-y = df[target]
-
-print(f"Dataset Shape: {df.shape}")
-print(f"Target Column: {target}")
-print(f"Features: {X.columns.tolist()}")
-
-
-
-# Preprocessor - must use 'num' and 'cat' as labels for naming consistency
-preprocessor = ColumnTransformer(
-    transformers=[
-        ('num', StandardScaler(), numeric_features),
-        ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
-    ]
-)
-
-# Pipeline - must use 'preprocessor' and 'regressor' as labels
-pipeline = Pipeline(steps=[
-    ('preprocessor', preprocessor),
-    ('regressor', RandomForestRegressor(n_estimators=100, random_state=42))
-])
-
-# Fit the model
-print("Training the model... please wait.")
-pipeline.fit(X, y)
-
-# Save the model pipeline
-with open('src/car_price_predictor.pkl', 'wb') as f:
-    pickle.dump(pipeline, f)
-
-print("Model trained and successfully saved to src/car_price_predictor.pkl")
+import argparse
+import copy
+import os
+import sys
+import time
+
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from carvault.dataset import list_partitions, load_dataset, read_partitions
+from carvault.features import FEATURES, NUMERIC_FEATURES, CATEGORICAL_FEATURES, TARGET
+from carvault.comparables import ComparablesIndex
+from carvault.options import build_option_index, known_mask
+from carvault.registry import REGISTRY_DIR, load_model, register
+from carvault.training import ENCODINGS, MODEL_FAMILIES, build_pipeline, grow, regression_metrics, search
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the CarVault price model.")
+    parser.add_argument('--models', nargs='+', default=MODEL_FAMILIES, choices=MODEL_FAMILIES,
+                        help="model families to search; the best cross-validated one is kept")
+    parser.add_argument('--search', default='random', choices=['random', 'halving', 'none'],
+                        help="randomized search, successive halving, or cross-validated default hyperparameters")
+    parser.add_argument('--n-iter', type=int, default=20, help="candidates per model family")
+    parser.add_argument('--encoding', default='onehot', choices=ENCODINGS,
+                        help="categorical encoding: sparse one-hot, or compact ordinal codes (7 dense columns)")
+    parser.add_argument('--cv', type=int, default=5, help="cross-validation folds")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="parallel workers (-1 = all cores)")
+    parser.add_argument('--test-size', type=float, default=0.2, help="holdout fraction for the metrics report")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--registry', default=REGISTRY_DIR, help="model registry directory")
+    parser.add_argument('--no-promote', action='store_true', help="register without making it the current version")
+    parser.add_argument('--refresh', action='store_true',
+                        help="grow the current model on partitions ingested since it was trained instead of retraining")
+    parser.add_argument('--add-trees', type=int, default=None,
+                        help="trees (rf) or boosting rounds (xgb) to add with --refresh (default: 20 / 50)")
+    parser.add_argument('--base-version', default=None, help="model version to refresh (default: CURRENT)")
+    return parser.parse_args()
+
+
+def refresh(args):
+    start = time.perf_counter()
+    parent = load_model(args.base_version, args.registry)
+    trained_on = set(parent.metadata.get('lineage', {}).get('partitions', []))
+    new = [p['name'] for p in list_partitions() if p['name'] not in trained_on]
+    if not new:
+        print(f"Model {parent.version} is up to date; no new partitions to learn from.")
+        return
+
+    df = read_partitions(new).to_pandas()
+    X, y = df[FEATURES], df[TARGET]
+    print(f"Refreshing {parent.version} on {len(new)} new partition(s), {len(df):,} rows")
+    if parent.options is not None:
+        unseen = int((~known_mask(X, parent.options)).sum())
+        if unseen:
+            print(f"  {unseen:,} rows use categories the model has never seen; a full retrain is needed to learn them")
+
+    before = regression_metrics(y, parent.predictor.predict(X))
+    pipeline = copy.deepcopy(parent.pipeline)
+    family = 'rf' if hasattr(pipeline.named_steps['regressor'], 'estimators_') else 'xgb'
+    added = args.add_trees or (20 if family == 'rf' else 50)
+    grow(pipeline, X, y, added, n_jobs=args.n_jobs)
+    after = regression_metrics(y, pipeline.predict(X))
+    print(f"  new-partition MAE {before['mae']:.4f} -> {after['mae']:.4f} (in-sample after refresh)")
+
+    artifact = register(
+        pipeline,
+        metrics={
+            **parent.metadata.get('metrics', {}),
+            'refresh': {'parent': parent.version, 'partitions': new, 'rows': len(df), 'added': added,
+                        'new_rows_before': before, 'new_rows_after': after,
+                        'seconds': round(time.perf_counter() - start, 2)},
+        },
+        options=parent.options,
+        registry_dir=args.registry,
+        # Rebuilt rather than copied, so the new partitions' listings show up as comparables
+        comparables=ComparablesIndex.from_frame(load_dataset()),
+        promote=not args.no_promote,
+        lineage={'parent': parent.version, 'partitions': sorted(trained_on | set(new))},
+    )
+    status = "registered" if args.no_promote else "registered and promoted to current"
+    print(f"Model refreshed (+{added} {'trees' if family == 'rf' else 'rounds'}) and {status}: {artifact.path}")
+
+
+def main():
+    args = parse_args()
+    if args.refresh:
+        return refresh(args)
+    start = time.perf_counter()
+
+    # Load the typed columnar dataset plus ingested partitions (header already repaired by convert_dataset.py)
+    df = load_dataset()
+
+    # Numeric and categorical features (names now guaranteed to match app)
+    X = df[NUMERIC_FEATURES + CATEGORICAL_FEATURES]
+    y = df[TARGET]
+
+    print(f"Dataset Shape: {df.shape}")
+    print(f"Target Column: {TARGET}")
+    print(f"Features: {X.columns.tolist()}")
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=args.test_size, random_state=args.seed)
+
+    # Model selection on the training split only; the holdout stays untouched
+    # --search none still cross-validates each family's defaults, so the choice and the CV metrics are real
+    results = []
+    for family in args.models:
+        print(f"Searching {family} ({args.search}, {args.cv}-fold CV, n_jobs={args.n_jobs})...")
+        result = search(family, X_train, y_train, args.search, args.n_iter, args.cv, args.n_jobs, args.seed,
+                        args.encoding)
+        print(f"  best CV RMSE {result['cv_rmse_mean']:.4f} ± {result['cv_rmse_std']:.4f} "
+              f"in {result['seconds']}s with {result['best_params']}")
+        results.append(result)
+    best = min(results, key=lambda r: r['cv_rmse_mean'])
+
+    # Holdout evaluation of the winning configuration
+    print(f"Evaluating {best['family']} on the {args.test_size:.0%} holdout...")
+    pipeline = build_pipeline(best['family'], args.seed, args.n_jobs, args.encoding).set_params(**best['best_params'])
+    pipeline.fit(X_train, y_train)
+    holdout = regression_metrics(y_test, pipeline.predict(X_test))
+    print(f"  MAE {holdout['mae']:.4f} | RMSE {holdout['rmse']:.4f} | R² {holdout['r2']:.4f}")
+
+    # Fit the model on all rows for deployment
+    print("Training the model... please wait.")
+    pipeline = build_pipeline(best['family'], args.seed, args.n_jobs, args.encoding).set_params(**best['best_params'])
+    pipeline.fit(X, y)
+    # Single-row app predictions are faster without a thread pool per call
+    pipeline.named_steps['regressor'].set_params(n_jobs=1)
+
+    # Register the pipeline as a new version, with its compiled forest, option index and metrics
+    artifact = register(
+        pipeline,
+        metrics={
+            'holdout': holdout,
+            'cv': {k: v for k, v in best.items() if k.startswith('cv_')},
+            'params': best['best_params'],
+            'encoding': args.encoding,
+            'search': results,
+            'rows': {'train': len(X_train), 'test': len(X_test), 'total': len(X)},
+            'seed': args.seed,
+            'training_seconds': round(time.perf_counter() - start, 2),
+        },
+        options=build_option_index(df),
+        registry_dir=args.registry,
+        comparables=ComparablesIndex.from_frame(df),
+        promote=not args.no_promote,
+        lineage={'partitions': [p['name'] for p in list_partitions()]},
+    )
+    status = "registered" if args.no_promote else "registered and promoted to current"
+    print(f"Model trained and {status}: {artifact.path}")
+
+
+if __name__ == '__main__':
+    main()
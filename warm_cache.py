@@ -0,0 +1,72 @@
+# Post-deploy warm-up of the prediction cache for a registered model version.
+#
+#   python warm_cache.py --top 200                      # most common cells of the training listings
+#   python warm_cache.py --traffic requests.parquet     # rank (and report coverage) by a request log
+#
+# Writes warm_cache.npz into the version's directory; the app and API seed their explanation
+# cache from it when they load that version, so the first users skip the SHAP cold path.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from carvault.batch import detect_format
+from carvault.dataset import load_dataset
+from carvault.explain import DEFAULT_CACHE_SIZE
+from carvault.features import FEATURES, missing_features, prepare_features
+from carvault.registry import REGISTRY_DIR, WARM_CACHE_FILE, load_model, resolve
+from carvault.shared import load_shared_explainer
+from carvault.warmup import BATCH_ROWS, TOP_N, coverage, save_warm_cache, top_configurations, warm
+
+
+def read_traffic(path):
+    import pandas as pd
+    df = pd.read_parquet(path) if detect_format(path) == 'parquet' else pd.read_csv(path)
+    missing = missing_features(df.columns)
+    if missing:
+        raise SystemExit(f"{path} is missing columns: {', '.join(missing)}")
+    X, valid = prepare_features(df)
+    return X[valid]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-compute explanations for the most common car configurations.")
+    parser.add_argument('--top', type=int, default=TOP_N, help="configurations to warm")
+    parser.add_argument('--traffic', default=None,
+                        help="CSV/Parquet of requested cars to rank and measure coverage by (default: the dataset)")
+    parser.add_argument('--batch-rows', type=int, default=BATCH_ROWS)
+    parser.add_argument('--version', default=None, help="registry version (default: CURRENT)")
+    parser.add_argument('--registry', default=REGISTRY_DIR)
+    args = parser.parse_args()
+
+    if not 0 < args.top <= DEFAULT_CACHE_SIZE:
+        parser.error(f"--top must be between 1 and the cache size ({DEFAULT_CACHE_SIZE})")
+    artifact = resolve(args.version, args.registry)
+    if artifact is None:
+        raise SystemExit("No registered model to warm; train one with train_model.py first.")
+    model = load_model(artifact.version, args.registry)
+    traffic = read_traffic(args.traffic) if args.traffic else load_dataset()[FEATURES]
+
+    records = top_configurations(traffic, args.top)
+    report = coverage(records, traffic)
+    print(f"Warming {len(records)} configurations of model {model.version} "
+          f"(ranked by {args.traffic or 'the training listings'}, {report['rows']:,} rows)")
+
+    start = time.perf_counter()
+    # Also leaves explainer.joblib behind, so serving processes memory-map it instead of building one
+    explainer = load_shared_explainer(model.pipeline, model.explainer_path)
+    progress = lambda n: print(f"\r{n:,}/{len(records):,} explained, {time.perf_counter() - start:.0f}s", end='', flush=True)  # noqa: E731
+    entries = warm(model.predictor, explainer, records, args.batch_rows, progress)
+    path = artifact.file(WARM_CACHE_FILE)
+    save_warm_cache(entries, path)
+    print(f"\nSaved {len(entries):,} explanations in {time.perf_counter() - start:.1f}s -> {path}")
+
+    print("Coverage of that traffic:")
+    print(f"  {report['configurations']:6.1%} of rows share a warmed Brand/Model/Fuel/Transmission/Ownership")
+    print(f"  {report['cells']:6.1%} fall in a warmed age/KM bucket of it")
+    print(f"  {report['exact']:6.1%} are cache hits as entered (exact inputs)")
+
+
+if __name__ == '__main__':
+    main()